@@ -18,3 +18,8 @@ class Item:
     attunement: bool = False
     tags: List[str] = field(default_factory=list)
     aliases: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        # Data files may hold null here; keep both as lists so callers can use them directly
+        self.tags = self.tags or []
+        self.aliases = self.aliases or []
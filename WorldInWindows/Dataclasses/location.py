@@ -4,6 +4,15 @@ from typing import List, Optional
 from .npc import NPC
 from .item import Item
 
+_BLOOM_BITS = 1024
+
+def trigram_bloom(text: str) -> int:
+    """Bloom filter (as an int bitmask) of the 3-character substrings of text."""
+    bits = 0
+    for g in {text[i:i + 3] for i in range(len(text) - 2)}:
+        bits |= 1 << (hash(g) % _BLOOM_BITS)
+    return bits
+
 @dataclass
 class Location:
     name: str
@@ -14,6 +23,13 @@ class Location:
     tags: List[str] = field(default_factory=list)
 
     parent: Optional['Location'] = None
+    # Direct children, filled in alongside parent by the Repo
+    children: List['Location'] = field(default_factory=list, compare=False, repr=False)
+
+    # Display/search text derived from the fields above; see cache_display_text()
+    short_desc: str = field(default="", init=False, compare=False, repr=False)
+    search_hay: str = field(default="", init=False, compare=False, repr=False)
+    hay_bloom: int = field(default=0, init=False, compare=False, repr=False)
 
     def add_npc(self, npc: NPC):
         if npc not in self.npcs:
@@ -63,7 +79,11 @@ class Location:
 
     def set_parent(self, parent: Optional["Location"]):
         """Set the parent location."""
+        if self.parent is not None:
+            self.parent.children = [c for c in self.parent.children if c is not self]
         self.parent = parent
+        if parent is not None:
+            parent.children.append(self)
 
     def short_description(self, max_len: int = 80) -> str:
         """Shortened description for list views/columns."""
@@ -71,6 +91,12 @@ class Location:
         return (d if len(d) <= max_len else d[:max_len].rstrip() + "…")
  
 
+    def cache_display_text(self):
+        """Precompute the tree's short description, case-folded search text and its trigram bloom."""
+        self.short_desc = self.short_description(80)
+        self.search_hay = " ".join([self.name, self.description or "", self.region or "", " ".join(self.tags or [])]).casefold()
+        self.hay_bloom = trigram_bloom(self.search_hay)
+
     def summary(self) -> dict:
         return {
             "name": self.name,
@@ -16,6 +16,11 @@ class Spell:
     tags: list[str] = field(default_factory=list)
     aliases: list[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        # Data files may hold null here; keep both as lists so callers can use them directly
+        self.tags = self.tags or []
+        self.aliases = self.aliases or []
+
 @dataclass
 class SpellSlot:
     level: int
@@ -1,16 +1,38 @@
 from PyQt6 import QtWidgets, QtCore
+from functools import lru_cache
 import json
+import os
 from pathlib import Path
 import shutil
 
 from ..theme import DMHelperTheme
-from ..repo import Repo
+from ..repo import append_json_record, get_shared_repo, update_json_record
 
 from ..config import Config
+from ..workers import run_in_background
 
 from ..Dataclasses import Race, Alignment, PcClassName, MonsterManual, PcClass, NPC, Item, Spell, Condition, Location, SpellSchool, Rarity
 from ..AIGen import SoundGenerationMode, SoundGenerator
 
+_MONSTER_PAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".bmp"})
+
+@lru_cache(maxsize=8)
+def _monster_page_names(folder: Path, mtime_ns: int) -> tuple[str, ...]:
+    """Display names of the Monster Manual page images in folder (mtime_ns keys the cache)."""
+    with os.scandir(folder) as it:
+        stems = sorted(os.path.splitext(e.name)[0] for e in it
+                       if os.path.splitext(e.name)[1].lower() in _MONSTER_PAGE_EXTENSIONS and e.is_file())
+    return tuple(stem.replace("_", " ").title() for stem in stems)
+
+_PC_CLASS_BY_VALUE = {p.value: p for p in PcClassName}
+
+def _pc_class_name(value: str):
+    pc_class_name = _PC_CLASS_BY_VALUE.get(value)
+    if pc_class_name is None:
+        # Stand-in for class names outside PcClassName; only .value is used
+        pc_class_name = type('PcClassName', (), {'value': value})()
+    return pc_class_name
+
 class AddEntryDialogBase(QtWidgets.QDialog):
     entry_name: str
     edit_entry: NPC | Item | Spell | Location | Condition | None
@@ -55,6 +77,7 @@ class AddNPCDialog(AddEntryDialogBase):
     def __init__(self, parent=None, edit_npc=None):
         super().__init__(entry_name="NPC", edit_entry=edit_npc, parent=parent)
         self.original_name = self.edit_entry.name if self.edit_entry else None  # Store original name for updates
+        self.saved_npc: NPC | None = None  # Set once save_npc has written the NPC
 
         self.resize(500, 700)
                 
@@ -69,6 +92,7 @@ class AddNPCDialog(AddEntryDialogBase):
         sorted_races = sorted(Race, key=lambda r: r.value)
         for race in sorted_races:
             self.race_combo.addItem(race.value, race)
+        self._race_index = {race: i for i, race in enumerate(sorted_races)}
         self.form.addRow("Race*:", self.race_combo)
         
         # Sex field
@@ -85,6 +109,7 @@ class AddNPCDialog(AddEntryDialogBase):
         self.alignment_combo = QtWidgets.QComboBox()
         for alignment in Alignment:
             self.alignment_combo.addItem(alignment.value, alignment)
+        self._alignment_index = {alignment: i for i, alignment in enumerate(Alignment)}
         self.form.addRow("Alignment*:", self.alignment_combo)
         
         # Stat Block fields - Type and Selection
@@ -95,9 +120,8 @@ class AddNPCDialog(AddEntryDialogBase):
         
         self.stat_block_selection_combo = QtWidgets.QComboBox()
         self.form.addRow("Stat Block:", self.stat_block_selection_combo)
-        
-        # Initialize with Monster Manual options
-        self.update_stat_block_options()
+        # Monster Manual options read the disk, so they're filled in on first show (see showEvent)
+        self._stat_block_options_ready = False
         
         # Appearance field
         self.appearance_field = QtWidgets.QTextEdit()
@@ -133,13 +157,19 @@ class AddNPCDialog(AddEntryDialogBase):
         note_label = QtWidgets.QLabel("* Required fields")
         note_label.setStyleSheet("color: #888; font-size: 11px;")
         self.vbox_layout.addWidget(note_label)
-                
-        # Populate fields if editing an existing NPC
-        if self.edit_entry:
-            self.populate_fields()
         
         # Focus on name field
         self.name_field.setFocus()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._stat_block_options_ready:
+            self._stat_block_options_ready = True
+            # Initialize with Monster Manual options
+            self.update_stat_block_options()
+            # Populate fields if editing an existing NPC
+            if self.edit_entry:
+                self.populate_fields()
     
     def ok_button_slot(self):
         self.save_npc()
@@ -152,10 +182,8 @@ class AddNPCDialog(AddEntryDialogBase):
         self.name_field.setText(npc.name)
         
         # Race
-        for i in range(self.race_combo.count()):
-            if self.race_combo.itemData(i) == npc.race:
-                self.race_combo.setCurrentIndex(i)
-                break
+        if npc.race in self._race_index:
+            self.race_combo.setCurrentIndex(self._race_index[npc.race])
         
         # Sex
         self.sex_combo.setCurrentText(npc.sex)
@@ -165,10 +193,8 @@ class AddNPCDialog(AddEntryDialogBase):
             self.age_field.setText(npc.age)
         
         # Alignment
-        for i in range(self.alignment_combo.count()):
-            if self.alignment_combo.itemData(i) == npc.alignment:
-                self.alignment_combo.setCurrentIndex(i)
-                break
+        if npc.alignment in self._alignment_index:
+            self.alignment_combo.setCurrentIndex(self._alignment_index[npc.alignment])
         
         # Stat Block
         if npc.stat_block:
@@ -177,20 +203,17 @@ class AddNPCDialog(AddEntryDialogBase):
                 self.stat_block_type_combo.setCurrentText("Monster Manual")
                 self.update_stat_block_options()  # Update options first
                 # Try to find and select the monster
-                monster_name = npc.stat_block.monster_name
-                for i in range(self.stat_block_selection_combo.count()):
-                    if self.stat_block_selection_combo.itemText(i) == monster_name:
-                        self.stat_block_selection_combo.setCurrentIndex(i)
-                        break
+                monster_index = self.stat_block_selection_combo.findText(npc.stat_block.monster_name)
+                if monster_index >= 0:
+                    self.stat_block_selection_combo.setCurrentIndex(monster_index)
             elif isinstance(npc.stat_block, PcClass):
                 self.stat_block_type_combo.setCurrentText("PC Class")
                 self.update_stat_block_options()  # Update options first
                 # Try to find and select the class
                 class_name = npc.stat_block.name.value if hasattr(npc.stat_block.name, 'value') else str(npc.stat_block.name)
-                for i in range(self.stat_block_selection_combo.count()):
-                    if self.stat_block_selection_combo.itemText(i) == class_name:
-                        self.stat_block_selection_combo.setCurrentIndex(i)
-                        break
+                class_index = self.stat_block_selection_combo.findText(class_name)
+                if class_index >= 0:
+                    self.stat_block_selection_combo.setCurrentIndex(class_index)
         
         # Appearance
         if npc.appearance:
@@ -222,21 +245,13 @@ class AddNPCDialog(AddEntryDialogBase):
             # Load Monster Manual files from Media/MonsterManual
             try:
                 monster_manual_dir = self.config.get_monster_manual_pages()
-                if monster_manual_dir.exists():
-                    # Get all image files (assuming they're the monster manual pages)
-                    image_files = []
-                    for ext in ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.bmp']:
-                        image_files.extend(monster_manual_dir.glob(ext))
-                    
-                    # Sort and add to combo
-                    monster_names = sorted([f.stem for f in image_files])
-                    nice_monster_names = []
-                    for name in monster_names:
-                        nice_name = name.replace("_", " ").title()
-                        nice_monster_names.append(nice_name)
-                    self.stat_block_selection_combo.addItems(nice_monster_names)
-                else:
+                try:
+                    mtime_ns = monster_manual_dir.stat().st_mtime_ns
+                except FileNotFoundError:
                     self.stat_block_selection_combo.addItem("No Monster Manual files found")
+                else:
+                    # Image files are assumed to be the monster manual pages; rescanned only when the folder changes
+                    self.stat_block_selection_combo.addItems(_monster_page_names(monster_manual_dir, mtime_ns))
             except Exception as e:
                 self.stat_block_selection_combo.addItem(f"Error loading Monster Manual: {e}")
                 
@@ -292,22 +307,14 @@ class AddNPCDialog(AddEntryDialogBase):
                         file_name = stat_block_name.replace(" ", "_").lower()
                         stat_block = MonsterManual(file_name=str(file_name))
                     else:  # PC Class
-                        try:
-                            pc_class_name = PcClassName(stat_block_name)
-                        except ValueError:
-                            pc_class_name = type('PcClassName', (), {'value': stat_block_name})()
-                        stat_block = PcClass(name=pc_class_name)
+                        stat_block = PcClass(name=_pc_class_name(stat_block_name))
             else:
                 # Creating a new NPC or no existing stat block
                 if stat_block_type == "Monster Manual":
                     file_name = stat_block_name.replace(" ", "_").lower()
                     stat_block = MonsterManual(file_name=str(file_name))
                 else:  # PC Class
-                    try:
-                        pc_class_name = PcClassName(stat_block_name)
-                    except ValueError:
-                        pc_class_name = type('PcClassName', (), {'value': stat_block_name})()
-                    stat_block = PcClass(name=pc_class_name)
+                    stat_block = PcClass(name=_pc_class_name(stat_block_name))
             
             # Parse additional traits
             traits_text = self.traits_field.toPlainText().strip()
@@ -337,22 +344,9 @@ class AddNPCDialog(AddEntryDialogBase):
                 alive=alive
             )
             
-            # Save to JSON file
-            # Find the original name by looking it up in the repository
-            original_name = None
-            if self.edit_entry:
-                try:
-                    repo = Repo(self.config.data_dir)
-                    repo.load_all()
-                    # Find the name by looking through npcs_by_name dictionary
-                    for npc_name, npc_obj in repo.npcs_by_name.items():
-                        if npc_obj is self.edit_entry or npc_obj.name == self.original_name:
-                            original_name = npc_name
-                            break
-                except Exception as e:
-                    print(f"Could not find original name: {e}")
-
+            # Save to JSON file; an edit replaces the record under the name captured when the dialog opened
             self.save_npc_to_json(npc, is_edit=self.edit_entry is not None, original_name=self.original_name)
+            self.saved_npc = npc
             
             QtWidgets.QMessageBox.information(self, "Success", 
                 f"NPC '{npc.name}' has been saved successfully!")
@@ -368,13 +362,6 @@ class AddNPCDialog(AddEntryDialogBase):
         # Path to npcs.json in the Data directory
         npcs_file = Path(self.config.data_dir) / "npcs.json"
         
-        # Load existing NPCs
-        if npcs_file.exists():
-            with open(npcs_file, 'r', encoding='utf-8') as f:
-                npcs_data = json.load(f)
-        else:
-            npcs_data = []
-        
         # Convert NPC to dictionary format matching repo expectations
         # Handle different stat block types for JSON serialization
         
@@ -425,28 +412,27 @@ class AddNPCDialog(AddEntryDialogBase):
             "alive": getattr(npc, 'alive', True)
         }
         
-        # Add or update NPC in the list
+        if not npcs_file.exists():
+            print(f"Adding new NPC: {npc_dict}")
+            with open(npcs_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps([npc_dict], indent=2, ensure_ascii=False))
+            return
+
+        # Add or update NPC in the list; only that record's text is re-encoded
         if is_edit and original_name:
-            updated = False
-            for i, existing_npc in enumerate(npcs_data):
-                if (original_name and existing_npc.get("name") == original_name):
-                    print(f"Updating existing NPC: {original_name} -> {npc.name}")
-                    npcs_data[i] = npc_dict
-                    updated = True
-                    break
-            
-            if not updated:
-                # Original NPC not found, add as new
-                print(f"Original NPC '{original_name}' not found, adding as new")
-                npcs_data.append(npc_dict)
+            def replace(existing_npc: dict):
+                existing_npc.clear()
+                existing_npc.update(npc_dict)
+
+            if update_json_record(npcs_file, lambda existing_npc: existing_npc.get("name") == original_name, replace):
+                print(f"Updating existing NPC: {original_name} -> {npc.name}")
+                return
+            # Original NPC not found, add as new
+            print(f"Original NPC '{original_name}' not found, adding as new")
         else:
             # Add new NPC
             print(f"Adding new NPC: {npc_dict}")
-            npcs_data.append(npc_dict)
-        
-        # Save back to file
-        with open(npcs_file, 'w', encoding='utf-8') as f:
-            json.dump(npcs_data, f, indent=2, ensure_ascii=False)
+        append_json_record(npcs_file, npc_dict)
 
 class AddSpellDialog(AddEntryDialogBase):
     def __init__(self, parent=None, edit_spell=None):
@@ -600,7 +586,7 @@ class AddSpellDialog(AddEntryDialogBase):
         
         # Save back to file
         with open(spells_file, 'w', encoding='utf-8') as f:
-            json.dump(spells_data, f, indent=2, ensure_ascii=False)
+            f.write(json.dumps(spells_data, indent=2, ensure_ascii=False))
 
 class AddItemDialog(AddEntryDialogBase):
     def __init__(self, parent=None, edit_item=None):
@@ -704,7 +690,7 @@ class AddItemDialog(AddEntryDialogBase):
             items_data.append(items_dict)
         
         with open(items_file, 'w', encoding='utf-8') as f:
-            json.dump(items_data, f, indent=2, ensure_ascii=False)
+            f.write(json.dumps(items_data, indent=2, ensure_ascii=False))
 
 class AddLocationDialog(AddEntryDialogBase):
     def __init__(self, parent=None, edit_location=None):
@@ -725,15 +711,19 @@ class AddLocationDialog(AddEntryDialogBase):
         self.form.addRow("Region/Area:", self.region_field)
 
         self.parent_field = QtWidgets.QComboBox()
-        # Check the locations from locatinos.json
         self.parent_field.addItem("None", None)  # Default option
-        locations_file = Path(self.config.data_dir) / "locations.json"
-        if locations_file.exists():
-            with open(locations_file, 'r', encoding='utf-8') as f:
-                locations_data = json.load(f)
-                for loc in locations_data:
-                    self.parent_field.addItem(loc.get("name", "Unnamed Location"), loc.get("name"))
+        if self.edit_entry and self.edit_entry.parent:
+            # Keeps the current parent selected (and saved) until the full list arrives
+            self.parent_field.addItem(self.edit_entry.parent.name, self.edit_entry.parent.name)
+            self.parent_field.setCurrentIndex(1)
         self.form.addRow("Parent Location:", self.parent_field)
+        # Locations come from the shared Repo, which may wait on a browser's load or
+        # re-read changed files, so it is fetched off the UI thread
+        self.parent_field.setEnabled(False)
+        data_dir = self.config.data_dir
+        self._parent_loader = run_in_background(
+            lambda: [loc.name for loc in get_shared_repo(data_dir).get_all_locations()],
+            on_done=self._fill_parent_locations, on_error=self._on_parent_locations_failed)
         
         if self.edit_entry:
             self.populate_fields()
@@ -743,12 +733,21 @@ class AddLocationDialog(AddEntryDialogBase):
         self.name_field.setText(location.name)
         self.description_field.setPlainText(location.description or "")
         self.region_field.setText(location.region or "")
-        
-        if location.parent:
-            for i in range(self.parent_field.count()):
-                if self.parent_field.itemData(i) == location.parent.name:
-                    self.parent_field.setCurrentIndex(i)
-                    break
+
+    def _fill_parent_locations(self, names: list[str]):
+        self._parent_loader = None
+        selected = self.parent_field.currentData()
+        self.parent_field.clear()
+        self.parent_field.addItem("None", None)
+        for name in names:
+            self.parent_field.addItem(name, name)
+        self.parent_field.setCurrentIndex(max(self.parent_field.findData(selected), 0))
+        self.parent_field.setEnabled(True)
+
+    def _on_parent_locations_failed(self, error: str):
+        self._parent_loader = None
+        print(f"Error loading locations: {error}")
+        self.parent_field.setEnabled(True)
 
     def ok_button_slot(self):
         self.add_location()
@@ -780,12 +779,6 @@ class AddLocationDialog(AddEntryDialogBase):
 
         locations_file = Path(self.config.data_dir) / "locations.json"
         
-        if locations_file.exists():
-            with open(locations_file, 'r', encoding='utf-8') as f:
-                locations_data = json.load(f)
-        else:
-            locations_data = []
-        
         location_dict = {
             "name": location.name,
             "description": location.description,
@@ -793,21 +786,20 @@ class AddLocationDialog(AddEntryDialogBase):
             "parent": location.parent
         }
         
+        if not locations_file.exists():
+            with open(locations_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps([location_dict], indent=2, ensure_ascii=False))
+            return
+
+        # Only the new or edited entry is encoded; the rest of the file is kept as is
         if self.edit_entry and self.original_name:
-            updated = False
-            for i, existing_loc in enumerate(locations_data):
-                if existing_loc.get("name") == self.original_name:
-                    locations_data[i] = location_dict
-                    updated = True
-                    break
-            if not updated:
-                locations_data.append(location_dict)
-        else:
-            locations_data.append(location_dict)
-        
-        # Save back to file
-        with open(locations_file, 'w', encoding='utf-8') as f:
-            json.dump(locations_data, f, indent=2, ensure_ascii=False)
+            def replace(existing_loc: dict):
+                existing_loc.clear()
+                existing_loc.update(location_dict)
+
+            if update_json_record(locations_file, lambda existing_loc: existing_loc.get("name") == self.original_name, replace):
+                return
+        append_json_record(locations_file, location_dict)
 
 class AddConditionDialog(AddEntryDialogBase):
     def __init__(self, parent=None, edit_condition=None):
@@ -886,11 +878,12 @@ class AddConditionDialog(AddEntryDialogBase):
         
         # Save back to file
         with open(conditions_file, 'w', encoding='utf-8') as f:
-            json.dump(conditions_data, f, indent=2, ensure_ascii=False)
+            f.write(json.dumps(conditions_data, indent=2, ensure_ascii=False))
 
 class AddSoundDialog(AddEntryDialogBase):
     def __init__(self, parent=None):
         super().__init__(entry_name="Sound", parent=parent)
+        self.added_path: Path | None = None  # Where the new clip was saved, once accepted
         
         # Sound Name field
         self.name_field = QtWidgets.QLineEdit()
@@ -988,6 +981,7 @@ class AddSoundDialog(AddEntryDialogBase):
                 
                 # Copy the file
                 shutil.copy2(source_file, target_path)
+                self.added_path = target_path
                 
                 QtWidgets.QMessageBox.information(self, "Success", 
                     f"Sound '{sound_name}' added successfully!\nCopied to: {target_path}")
@@ -1015,6 +1009,7 @@ class AddSoundDialog(AddEntryDialogBase):
                     # Generate the sound
                     sound_generator = SoundGenerator()
                     audio_path = sound_generator.generate_and_save_sound(description, safe_name, duration, mode)
+                    self.added_path = Path(audio_path) if audio_path else None
                     
                     # Close the progress dialog
                     progress.close()
@@ -1,9 +1,9 @@
 from PyQt6 import QtWidgets
 from pathlib import Path
-import json
 
 from ..theme import DMHelperTheme
 from ..config import Config
+from ..repo import update_json_record
 
 from ..Dataclasses import NPC
 
@@ -101,22 +101,9 @@ class CampaignNotesDialog(QtWidgets.QDialog):
         if not npcs_file.exists():
             raise Exception("NPCs file not found")
         
-        # Load existing NPCs
-        with open(npcs_file, 'r', encoding='utf-8') as f:
-            npcs_data = json.load(f)
-        
-        # Find and update the NPC entry
-        npc_updated = False
-        for npc_entry in npcs_data:
-            if npc_entry.get("name") == self.npc.name:
-                npc_entry["campaign_notes"] = self.npc.campaign_notes
-                npc_updated = True
-                break
-        
-        if not npc_updated:
-            raise Exception(f"Could not find NPC '{self.npc.name}' in the data file")
-        
-        # Save back to file
-        with open(npcs_file, 'w', encoding='utf-8') as f:
-            json.dump(npcs_data, f, indent=2, ensure_ascii=False)
+        def set_notes(npc_entry: dict):
+            npc_entry["campaign_notes"] = self.npc.campaign_notes
 
+        # Rewrite just this NPC's record rather than re-encoding the whole file
+        if not update_json_record(npcs_file, lambda npc_entry: npc_entry.get("name") == self.npc.name, set_notes):
+            raise Exception(f"Could not find NPC '{self.npc.name}' in the data file")
@@ -3,6 +3,7 @@ import json
 from pathlib import Path
 
 from ..theme import DMHelperTheme
+from ..config import Config
 
 from ..Dataclasses import PcClass, AbilityScores
 
@@ -121,7 +122,6 @@ class EditPcClassDialog(QtWidgets.QDialog):
             self.pc_class.spells = [line.strip() for line in spells_text.split('\n') if line.strip()]
             
             if self.npc:
-                from ..config import Config
                 config = Config()
                 npcs_file = Path(config.data_dir) / "npcs.json"
                 
@@ -149,7 +149,7 @@ class EditPcClassDialog(QtWidgets.QDialog):
                     
                     # Save back to file
                     with open(npcs_file, 'w', encoding='utf-8') as f:
-                        json.dump(npcs_data, f, indent=2, ensure_ascii=False)
+                        f.write(json.dumps(npcs_data, indent=2, ensure_ascii=False))
             
             QtWidgets.QMessageBox.information(self, "Success", 
                 "PC Class stat block has been updated!")
@@ -4,15 +4,21 @@ class HoverPreview(QtWidgets.QDialog):
     """Small non-modal popup for hover previews."""
     def __init__(self, parent=None):
         super().__init__(parent, QtCore.Qt.WindowType.ToolTip)
+        # Shown on every hover; never take focus from the window being hovered
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_ShowWithoutActivating, True)
         self.label = QtWidgets.QLabel()
         self.label.setWordWrap(True)
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(8, 8, 8, 8)
         layout.addWidget(self.label)
+        self._last_text: str | None = None
 
     def show_text(self, text: str, global_pos: QtCore.QPoint):
-        self.label.setText(text)
-        self.adjustSize()
+        # Same preview again (e.g. re-hovering a link): only the position changes
+        if text != self._last_text:
+            self.label.setText(text)
+            self.adjustSize()
+            self._last_text = text
         # Offset a bit so it doesn't sit under the cursor
         self.move(global_pos + QtCore.QPoint(12, 18))
         self.show()
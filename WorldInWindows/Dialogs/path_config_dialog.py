@@ -1,6 +1,7 @@
 from PyQt6 import QtWidgets
 
 from ..config import Config
+from ..repo import clear_shared_repos
 
 class PathConfigDialog(QtWidgets.QDialog):
     """Dialog for configuring Data and Media directory paths"""
@@ -92,6 +93,7 @@ class PathConfigDialog(QtWidgets.QDialog):
         self.config.data_dir = new_data_dir
         self.config.media_dir = new_media_dir
         self.config.save()
+        clear_shared_repos()
 
         QtWidgets.QMessageBox.information(self, "Paths Updated",
             "Directory paths have been updated. Please restart the application for changes to take effect.")
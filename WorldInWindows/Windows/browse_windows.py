@@ -1,12 +1,15 @@
 from PyQt6 import QtCore, QtGui, QtWidgets
+import os
 import subprocess
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List
 
 from ..theme import DMHelperTheme
-from ..repo import Repo
+from ..repo import get_shared_repo
 from ..config import Config
+from ..workers import run_in_background
 
 from ..knowledge_base import KnowledgeBase      # HMMMMMM
 
@@ -16,7 +19,8 @@ from ..Dialogs import AddSoundDialog, AddNPCDialog, AddSpellDialog, AddItemDialo
 from .detail_windows import SpellDetailWindow, ItemDetailWindow, NPCDetailWindow, LocationDetailWindow, ConditionDetailWindow
 
 
-ROLE_NPC_PTR = QtCore.Qt.ItemDataRole.UserRole + 2  # Defined here and in main_window.py, gross
+ROLE_SEARCH_TEXT = QtCore.Qt.ItemDataRole.UserRole + 1  # Case-folded text the filter proxy matches against
+ROLE_NPC_PTR = QtCore.Qt.ItemDataRole.UserRole + 2
 
 # Base class
 class BrowserWindowBase(QtWidgets.QMainWindow):
@@ -25,12 +29,17 @@ class BrowserWindowBase(QtWidgets.QMainWindow):
     title_layout: QtWidgets.QHBoxLayout
     button_layout: QtWidgets.QHBoxLayout
 
-    entry_list: QtWidgets.QListWidget
+    entry_list: QtWidgets.QListView
+    entry_model: QtGui.QStandardItemModel
+    entry_proxy: QtCore.QSortFilterProxyModel
 
     def __init__(self, entry_to_browse: str, kb: KnowledgeBase, parent=None):
         super().__init__(parent)
         self.config = Config()
         self.kb = kb
+        self.entry_name = entry_to_browse
+        self._loader = None
+        self._applied_needle = ""  # search string the proxy is currently filtering on
         self.setWindowTitle(f"{entry_to_browse} Browser")
         self.resize(800, 600)
 
@@ -54,18 +63,38 @@ class BrowserWindowBase(QtWidgets.QMainWindow):
         # Search bar
         self.search = QtWidgets.QLineEdit()
         self.search.setPlaceholderText(f"Search {entry_to_browse}s...")
-        self.search.textChanged.connect(self.filter_entries)
+        # Debounce: restarting the timer on each keystroke filters once typing pauses
+        self._filter_timer = QtCore.QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self._on_search_changed)
+        self.search.textChanged.connect(lambda _text: self._filter_timer.start())
         self.vbox_layout.addWidget(self.search)
 
-        # Entry list
-        self.entry_list = QtWidgets.QListWidget()
-        self.entry_list.itemDoubleClicked.connect(self.open_entry_detail)
+        # Entry list: items live in entry_model; the view shows them through a filter
+        # proxy, so searching is one C++ pass instead of a setHidden call per row
+        self.entry_model = QtGui.QStandardItemModel(self)
+        self.entry_proxy = QtCore.QSortFilterProxyModel(self)
+        self.entry_proxy.setSourceModel(self.entry_model)
+        self.entry_proxy.setFilterRole(ROLE_SEARCH_TEXT)
+        # Both sides are case-folded already, so the cheaper case-sensitive compare is enough
+        self.entry_proxy.setFilterCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseSensitive)
+        self.entry_list = QtWidgets.QListView()
+        self.entry_list.setModel(self.entry_proxy)
+        self.entry_list.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.entry_list.doubleClicked.connect(self._on_entry_double_clicked)
         self.entry_list.setSpacing(2)
         self.entry_list.setUniformItemSizes(True)
+        # Lay out long lists in chunks instead of all at once
+        self.entry_list.setLayoutMode(QtWidgets.QListView.LayoutMode.Batched)
+        self.entry_list.setBatchSize(200)
+        self.entry_list.setViewMode(QtWidgets.QListView.ViewMode.ListMode)
+        self.entry_list.setMovement(QtWidgets.QListView.Movement.Static)
         self.vbox_layout.addWidget(self.entry_list)
 
-        # Populate with entries
-        self.populate_entries()
+        # Populate with entries once the window has had a chance to paint
+        self._show_loading_placeholder()
+        QtCore.QTimer.singleShot(0, self.populate_entries)
 
         # Close button
         close_btn = QtWidgets.QPushButton("Close")
@@ -79,17 +108,95 @@ class BrowserWindowBase(QtWidgets.QMainWindow):
 
     # Following methods to be defined in derived classes
 
+    @contextmanager
+    def _paused_list_updates(self):
+        """Suspend repaints and signals on entry_list while it is refilled or filtered."""
+        self.entry_list.setUpdatesEnabled(False)
+        self.entry_list.blockSignals(True)
+        try:
+            yield
+        finally:
+            self.entry_list.blockSignals(False)
+            self.entry_list.setUpdatesEnabled(True)
+            self.entry_list.viewport().update()
+
     def populate_entries(self, new_entries: List):
-        self.entry_list.clear()
-        new_entries.sort(key=lambda x: x.name.lower())
+        new_entries.sort(key=lambda x: (x.name or "").lower())
+        items = []
         for entry in new_entries:
-            item = QtWidgets.QListWidgetItem(entry.name)
-            item.setData(QtCore.Qt.ItemDataRole.UserRole, entry)
+            item = QtGui.QStandardItem(entry.name or "")
+            item.setData(entry, QtCore.Qt.ItemDataRole.UserRole)
+            item.setData(self.searchable_text(entry).casefold(), ROLE_SEARCH_TEXT)
             item.setSizeHint(QtCore.QSize(0, 32))
-            self.entry_list.addItem(item)
+            items.append(item)
+        self._set_entry_items(items)
+
+    def _set_entry_items(self, items: List[QtGui.QStandardItem]):
+        """Replace the list's rows with items, inserted into the model in one go."""
+        with self._paused_list_updates():
+            self.entry_model.clear()
+            if items:
+                # One rowsInserted for the whole list instead of one per appendRow
+                self.entry_model.appendColumn(items)
+
+    def load_entries_in_background(self, fetch):
+        """Run fetch() off the UI thread, then show its entries with show_entries()."""
+        self._show_loading_placeholder()
+        self._loader = run_in_background(fetch, on_done=self._on_entries_loaded, on_error=self._on_entries_failed)
+
+    def _show_loading_placeholder(self):
+        self.entry_model.clear()
+        # Show the placeholder whatever was searched for; the search is re-applied after loading
+        self.entry_proxy.setFilterFixedString("")
+        self._applied_needle = ""
+        placeholder = QtGui.QStandardItem("Loading…")
+        placeholder.setFlags(QtCore.Qt.ItemFlag.NoItemFlags)
+        self.entry_model.appendRow(placeholder)
+
+    def current_item(self) -> QtGui.QStandardItem | None:
+        return self._item_at(self.entry_list.currentIndex())
+
+    def _item_at(self, index: QtCore.QModelIndex) -> QtGui.QStandardItem | None:
+        # View indexes belong to the filter proxy
+        if not index.isValid():
+            return None
+        return self.entry_model.itemFromIndex(self.entry_proxy.mapToSource(index))
+
+    def _on_entry_double_clicked(self, index: QtCore.QModelIndex):
+        item = self._item_at(index)
+        if item is not None:
+            self.open_entry_detail(item)
+
+    def _on_search_changed(self):
+        # Only the "Loading…" placeholder is listed until the load finishes
+        if self._loader is None:
+            self.filter_entries(self.search.text())
+
+    def _on_entries_loaded(self, entries: List):
+        self._loader = None
+        self.show_entries(entries)
+        # Re-apply whatever was typed while loading
+        self.filter_entries(self.search.text())
+
+    def _on_entries_failed(self, error: str):
+        print(f"Failed to load {self.entry_name.lower()}s from repo: {error}")
+        self._on_entries_loaded([])
+
+    def show_entries(self, entries: List):
+        BrowserWindowBase.populate_entries(self, entries)
+
+    def searchable_text(self, entry) -> str:
+        return entry.name
 
-    def filter_entries(self):
-        pass
+    def filter_entries(self, text: str):
+        needle = text.strip().casefold()
+        # e.g. only trailing whitespace was typed; rows added since are filtered by the proxy already
+        if needle == self._applied_needle:
+            return
+        self._applied_needle = needle
+        # One repaint once the proxy has re-filtered
+        with self._paused_list_updates():
+            self.entry_proxy.setFilterFixedString(needle)
 
     def open_entry_detail(self):
         pass
@@ -102,35 +209,24 @@ class SpellBrowserWindow(BrowserWindowBase):
         super().__init__("Spell", kb, parent)
 
     def populate_entries(self):
-        try:
-            repo = Repo(self.config.data_dir)
-            repo.load_all()
-            all_spells = list(repo.spells)
-        except Exception as e:
-            print(f"Failed to load spells from repo: {e}")
-            all_spells = []
-        super().populate_entries(all_spells)
-
-    def filter_entries(self, text: str):
-        text = text.lower().strip()
-        for i in range(self.entry_list.count()):
-            item = self.entry_list.item(i)
-            spell = item.data(QtCore.Qt.ItemDataRole.UserRole)
-            searchable_text = " ".join([
-                spell.name,
-                str(spell.level),
-                spell.school,
-                spell.casting_time,
-                spell.range,
-                spell.components,
-                spell.duration,
-                spell.description or "",
-                " ".join(getattr(spell, "tags", [])),
-                " ".join(getattr(spell, "aliases", [])),
-            ]).lower()
-            item.setHidden(text not in searchable_text if text else False)
-
-    def open_entry_detail(self, item: QtWidgets.QListWidgetItem):
+        data_dir = self.config.data_dir
+        self.load_entries_in_background(lambda: list(get_shared_repo(data_dir).spells))
+
+    def searchable_text(self, spell: Spell) -> str:
+        return " ".join([
+            spell.name or "",
+            str(spell.level),
+            spell.school or "",
+            spell.casting_time or "",
+            spell.range or "",
+            spell.components or "",
+            spell.duration or "",
+            spell.description or "",
+            " ".join(spell.tags),
+            " ".join(spell.aliases),
+        ])
+
+    def open_entry_detail(self, item: QtGui.QStandardItem):
         spell = item.data(QtCore.Qt.ItemDataRole.UserRole)
         if not spell:
             return
@@ -149,31 +245,20 @@ class ItemBrowserWindow(BrowserWindowBase):
         super().__init__("Item", kb, parent)
 
     def populate_entries(self):
-        try:
-            repo = Repo(self.config.data_dir)
-            repo.load_all()
-            all_items = list(repo.items)
-        except Exception as e:
-            print(f"Failed to load items from repo: {e}")
-            all_items = []
-        super().populate_entries(all_items)
-
-    def filter_entries(self, text: str):
-        text = text.lower().strip()
-        for i in range(self.entry_list.count()):
-            item_widget = self.entry_list.item(i)
-            item = item_widget.data(QtCore.Qt.ItemDataRole.UserRole)
-            searchable_text = " ".join([
-                item.name,
-                item.rarity,
-                item.description or "",
-                " ".join(getattr(item, "tags", [])),
-                " ".join(getattr(item, "aliases", [])),
-                "attunement" if item.attunement else "",
-            ]).lower()
-            item_widget.setHidden(text not in searchable_text if text else False)
-
-    def open_entry_detail(self, item_widget: QtWidgets.QListWidgetItem):
+        data_dir = self.config.data_dir
+        self.load_entries_in_background(lambda: list(get_shared_repo(data_dir).items))
+
+    def searchable_text(self, item: Item) -> str:
+        return " ".join([
+            item.name or "",
+            item.rarity or "",
+            item.description or "",
+            " ".join(item.tags),
+            " ".join(item.aliases),
+            "attunement" if item.attunement else "",
+        ])
+
+    def open_entry_detail(self, item_widget: QtGui.QStandardItem):
         item = item_widget.data(QtCore.Qt.ItemDataRole.UserRole)
         if not item:
             return
@@ -187,6 +272,25 @@ class ItemBrowserWindow(BrowserWindowBase):
             # populate_entries() will reload data from JSON files
             self.populate_entries()
 
+_AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.ogg', '.flac'})
+
+def _scan_audio_files(audio_dir: Path) -> List[Path]:
+    """Audio clips in audio_dir, sorted by name. Runs off the UI thread."""
+    # Look for audio files in Media/Audio directory, in one pass over it
+    audio_files = []
+    try:
+        with os.scandir(audio_dir) as it:
+            for e in it:
+                dot = e.name.rfind('.')
+                if dot > 0 and e.name[dot:].lower() in _AUDIO_EXTENSIONS and e.is_file():
+                    audio_files.append(e)
+    except FileNotFoundError:
+        return []
+    
+    # Sort by name
+    audio_files.sort(key=lambda e: e.name.lower())
+    return [Path(e.path) for e in audio_files]
+
 class SoundBrowserWindow(BrowserWindowBase):
     """Window for browsing and generating audio clips"""
     def __init__(self, kb: KnowledgeBase, parent=None):
@@ -208,67 +312,77 @@ class SoundBrowserWindow(BrowserWindowBase):
         self.button_layout.insertWidget(2, delete_btn)
         
     def populate_entries(self):
-        # This implementation is a bit different so we don't call the super's method
-        self.entry_list.clear()
-        
-        # Look for audio files in Media/Audio directory
+        # Scan Media/Audio on a worker thread; show_entries() fills the list
         audio_dir = self.config.get_audio_files()
-        if not audio_dir.exists():
-            return
-        
-        # Find all audio files
-        audio_extensions = {'.mp3', '.wav', '.m4a', '.ogg', '.flac'}
-        audio_files = []
-        
-        for ext in audio_extensions:
-            audio_files.extend(audio_dir.glob(f'*{ext}'))
-        
-        # Sort by name
-        audio_files.sort(key=lambda x: x.name.lower())
-        
+        self.load_entries_in_background(lambda: _scan_audio_files(audio_dir))
+
+    def show_entries(self, audio_files: List[Path]):
+        # This implementation is a bit different so we don't call the super's method
+        items = [self._make_sound_item(audio_file) for audio_file in audio_files]
         # Add to list widget
-        for audio_file in audio_files:
-            item = QtWidgets.QListWidgetItem(audio_file.stem)  # Name without extension
-            item.setData(QtCore.Qt.ItemDataRole.UserRole, str(audio_file))  # Store full path
-            item.setSizeHint(QtCore.QSize(0, 32))
-            self.entry_list.addItem(item)
+        self._set_entry_items(items)
 
-    def filter_entries(self, text: str):
-        """Filter the sounds list based on search text"""
-        text = text.lower().strip()
-        
-        for i in range(self.entry_list.count()):
-            item = self.entry_list.item(i)
-            # Search in filename
-            item.setHidden(text not in item.text().lower() if text else False)
+    def _make_sound_item(self, audio_file: Path) -> QtGui.QStandardItem:
+        item = QtGui.QStandardItem(audio_file.stem)  # Name without extension
+        item.setData(audio_file, QtCore.Qt.ItemDataRole.UserRole)  # Store full path
+        item.setData(audio_file.stem.casefold(), ROLE_SEARCH_TEXT)  # Search in filename
+        item.setSizeHint(QtCore.QSize(0, 32))
+        return item
 
     def add_entry(self):
         """Add/generate a new sound"""
         dialog = AddSoundDialog(self)
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
-            # Refresh the sounds list to show the new sound
-            self.populate_entries()
+            # Show the new sound without rescanning the directory when we can
+            if not self._insert_sound(dialog.added_path):
+                self.populate_entries()
+
+    def _insert_sound(self, audio_file: Path | None) -> bool:
+        """Insert one clip at its sorted row. False if the list needs a full rescan instead."""
+        if (self._loader is not None or audio_file is None
+                or audio_file.parent != self.config.get_audio_files()
+                or audio_file.suffix.lower() not in _AUDIO_EXTENSIONS):
+            return False
+        def path_at(row: int) -> Path:
+            return self.entry_model.item(row).data(QtCore.Qt.ItemDataRole.UserRole)
+
+        # Binary search for the row, same order as _scan_audio_files
+        key = audio_file.name.lower()
+        lo, hi = 0, self.entry_model.rowCount()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if path_at(mid).name.lower() < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.entry_model.rowCount() and path_at(lo) == audio_file:
+            return True  # Overwrote an existing clip; it is already listed
+        self.entry_model.insertRow(lo, self._make_sound_item(audio_file))
+        return True
 
     def play_selected_sound(self):
         """Play the selected audio clip"""
-        current_item = self.entry_list.currentItem()
+        current_item = self.current_item()
         if not current_item:
             QtWidgets.QMessageBox.information(self, "No Selection", "Please select an audio clip to play.")
             return
         
-        audio_path = current_item.data(QtCore.Qt.ItemDataRole.UserRole)
+        audio_path = str(current_item.data(QtCore.Qt.ItemDataRole.UserRole))
         try:
             # Try to play using system default audio player
             
+            # Launchers are started detached so the UI doesn't wait on them
             if sys.platform == "win32":
                 # Windows
-                subprocess.run(['start', '', audio_path], shell=True, check=False)
+                os.startfile(audio_path)
             elif sys.platform == "darwin":
                 # macOS
-                subprocess.run(['open', audio_path], check=False)
+                subprocess.Popen(['open', audio_path], stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, start_new_session=True)
             else:
                 # Linux
-                subprocess.run(['xdg-open', audio_path], check=False)
+                subprocess.Popen(['xdg-open', audio_path], stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, start_new_session=True)
                 
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Playback Error", 
@@ -281,24 +395,25 @@ class SoundBrowserWindow(BrowserWindowBase):
 
     def delete_selected_sound(self):
         """Delete the selected audio clip"""
-        current_item = self.entry_list.currentItem()
+        current_item = self.current_item()
         if not current_item:
             QtWidgets.QMessageBox.information(self, "No Selection", "Please select an audio clip to delete.")
             return
         
-        audio_path = Path(current_item.data(QtCore.Qt.ItemDataRole.UserRole))
+        audio_path: Path = current_item.data(QtCore.Qt.ItemDataRole.UserRole)
+        clip_name = current_item.text()  # The item goes away when the list is refilled
         
         # Confirm deletion
         reply = QtWidgets.QMessageBox.question(self, "Confirm Delete",
-            f"Are you sure you want to delete '{current_item.text()}'?",
+            f"Are you sure you want to delete '{clip_name}'?",
             QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No)
         
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
             try:
                 audio_path.unlink()  # Delete the file
-                self.populate_entries()  # Refresh the list
+                self.entry_model.removeRow(current_item.row())  # Drop just its row
                 QtWidgets.QMessageBox.information(self, "Deleted", 
-                    f"Audio clip '{current_item.text()}' has been deleted.")
+                    f"Audio clip '{clip_name}' has been deleted.")
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Delete Error", 
                     f"Could not delete file:\n{str(e)}")
@@ -309,75 +424,51 @@ class NPCBrowserWindow(BrowserWindowBase):
         super().__init__("NPC", kb, parent)
                         
     def populate_entries(self):
+        # Load NPCs from the shared repository (reloads if the JSON files changed, e.g. a new NPC)
+        data_dir = self.config.data_dir
+        self.load_entries_in_background(lambda: list(get_shared_repo(data_dir).npcs_by_name.values()))
+
+    def show_entries(self, all_npcs: List[NPC]):
         # This implementation is a bit different so we don't call the super's method
-        self.entry_list.clear()
-        
-        # Load NPCs directly from the repository (freshly loaded from JSON)
-        try:
-            repo = Repo(self.config.data_dir)
-            repo.load_all()  # This will reload from JSON files including any new NPCs
-            
-            # Get all NPCs from the repository
-            all_npcs = list(repo.npcs_by_name.values())
-            
-        except Exception as e:
-            # Fallback to knowledge base if repo loading fails
-            print(f"Failed to load from repo: {e}")
-            all_npcs = []
-            if hasattr(self.kb, 'entries'):
-                # Extract NPC entries from knowledge base
-                for entry in self.kb.entries.values():
-                    if isinstance(entry.content, NPC):
-                        # This is a fallback - we won't have the full NPC object
-                        # but at least we can show the names
-                        pass
-        
         # Sort NPCs by name
         all_npcs.sort(key=lambda x: x.name.lower())
         
         # Add to list widget
-        for npc in all_npcs:
-            # Add deceased indicator to name if not alive
-            display_name = npc.name
-            if not npc.alive:
-                display_name = f"{npc.name} ☠️ [DECEASED]"
-            
-            item = QtWidgets.QListWidgetItem(display_name)
-            item.setData(ROLE_NPC_PTR, npc)
-            
-            # Set proper item size for better spacing
-            item.setSizeHint(QtCore.QSize(0, 32))  # Height of 32 pixels for each item
-            
-            # Style deceased NPCs differently
-            if not npc.alive:
-                item.setForeground(QtGui.QColor("#888888"))  # Gray text for deceased
-                font = item.font()
-                font.setItalic(True)
-                item.setFont(font)
-            self.entry_list.addItem(item)
+        self._set_entry_items([self._make_npc_item(npc) for npc in all_npcs])
+
+    def _make_npc_item(self, npc: NPC) -> QtGui.QStandardItem:
+        # Add deceased indicator to name if not alive
+        display_name = npc.name
+        if not npc.alive:
+            display_name = f"{npc.name} ☠️ [DECEASED]"
     
-    def filter_entries(self, text: str):
-        """Filter the NPCs list based on search text"""
-        text = text.lower().strip()
-        
-        for i in range(self.entry_list.count()):
-            item = self.entry_list.item(i)
-            npc = item.data(ROLE_NPC_PTR)
-            
-            # Search in name, race, alignment, and appearance
-            searchable_text = " ".join([
-                npc.name,
-                npc.race.value,
-                npc.alignment.value,
-                npc.appearance or "",
-                npc.personality or "",
-                npc.backstory or ""
-            ]).lower()
-            
-            # Show/hide based on search match
-            item.setHidden(text not in searchable_text if text else False)
+        item = QtGui.QStandardItem(display_name)
+        item.setData(npc, ROLE_NPC_PTR)
+        item.setData(self.searchable_text(npc).casefold(), ROLE_SEARCH_TEXT)
     
-    def open_entry_detail(self, item: QtWidgets.QListWidgetItem):
+        # Set proper item size for better spacing
+        item.setSizeHint(QtCore.QSize(0, 32))  # Height of 32 pixels for each item
+    
+        # Style deceased NPCs differently
+        if not npc.alive:
+            item.setForeground(QtGui.QColor("#888888"))  # Gray text for deceased
+            font = item.font()
+            font.setItalic(True)
+            item.setFont(font)
+        return item
+    
+    def searchable_text(self, npc: NPC) -> str:
+        # Search in name, race, alignment, and appearance
+        return " ".join([
+            npc.name,
+            npc.race.value,
+            npc.alignment.value,
+            npc.appearance or "",
+            npc.personality or "",
+            npc.backstory or ""
+        ])
+    
+    def open_entry_detail(self, item: QtGui.QStandardItem):
         """Open the NPC detail window"""
         npc = item.data(ROLE_NPC_PTR)
         if not npc:
@@ -388,35 +479,48 @@ class NPCBrowserWindow(BrowserWindowBase):
     def add_entry(self):
         dialog = AddNPCDialog(self)
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
-            # Refresh the NPCs list to show the new NPC
-            # populate_entries() will reload data from JSON files
-            self.populate_entries()
+            # Show the new NPC; fall back to reloading from the JSON files
+            if not self._insert_npc(dialog.saved_npc):
+                self.populate_entries()
+
+    def _insert_npc(self, npc: NPC | None) -> bool:
+        """Insert one NPC at its sorted row. False if the list needs a full reload instead."""
+        if self._loader is not None or npc is None:
+            return False
+        def npc_at(row: int) -> NPC:
+            return self.entry_model.item(row).data(ROLE_NPC_PTR)
+
+        # Binary search for the row, same order as show_entries
+        key = npc.name.lower()
+        lo, hi = 0, self.entry_model.rowCount()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if npc_at(mid).name.lower() < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        row = lo
+        while row < self.entry_model.rowCount() and npc_at(row).name.lower() == key:
+            if npc_at(row).name == npc.name:
+                return False  # Replaces an NPC of the same name; let the reload sort it out
+            row += 1
+        self.entry_model.insertRow(lo, self._make_npc_item(npc))
+        return True
 
 class LocationBrowserWindow(BrowserWindowBase):
-    def __init__(self, kb: KnowledgeBase, locations: List[Location], repo: Repo, parent=None):
-        self.locations = locations
-        self.repo = repo
+    def __init__(self, kb: KnowledgeBase, parent=None):
         super().__init__("Location", kb, parent)
 
     def populate_entries(self):
-        # Get all locations from repo (including nested ones)
-        all_locations = self.repo.get_all_locations()
-        super().populate_entries(all_locations)
+        # All locations, including nested ones (reloads if the JSON files changed, e.g. a new location)
+        data_dir = self.config.data_dir
+        self.load_entries_in_background(lambda: get_shared_repo(data_dir).get_all_locations())
 
-    def filter_entries(self, text: str):
-        text = text.lower().strip()
-        for i in range(self.entry_list.count()):
-            item = self.entry_list.item(i)
-            loc = item.data(QtCore.Qt.ItemDataRole.UserRole)
-            searchable_text = " ".join([
-                loc.name,
-                loc.region or "",
-                loc.description or "",
-                " ".join(getattr(loc, "tags", [])),
-            ]).lower()
-            item.setHidden(text not in searchable_text if text else False)
-
-    def open_entry_detail(self, item: QtWidgets.QListWidgetItem):
+    def searchable_text(self, loc: Location) -> str:
+        # Precomputed (and already case-folded) when the Repo loaded the location
+        return loc.search_hay
+
+    def open_entry_detail(self, item: QtGui.QStandardItem):
         loc = item.data(QtCore.Qt.ItemDataRole.UserRole)
         if not loc:
             return
@@ -433,27 +537,16 @@ class ConditionBrowserWindow(BrowserWindowBase):
         super().__init__("Condition", kb, parent)
 
     def populate_entries(self):
-        try:
-            repo = Repo(self.config.data_dir)
-            repo.load_all()
-            all_conditions = list(repo.conditions)
-        except Exception as e:
-            print(f"Failed to load conditions from repo: {e}")
-            all_conditions = []
-        super().populate_entries(all_conditions)
+        data_dir = self.config.data_dir
+        self.load_entries_in_background(lambda: list(get_shared_repo(data_dir).conditions))
 
-    def filter_entries(self, text: str):
-        text = text.lower().strip()
-        for i in range(self.entry_list.count()):
-            item = self.entry_list.item(i)
-            condition = item.data(QtCore.Qt.ItemDataRole.UserRole)
-            searchable_text = " ".join([
-                condition.name,
-                condition.description or "",
-            ]).lower()
-            item.setHidden(text not in searchable_text if text else False)
-
-    def open_entry_detail(self, item: QtWidgets.QListWidgetItem):
+    def searchable_text(self, condition) -> str:
+        return " ".join([
+            condition.name or "",
+            condition.description or "",
+        ])
+
+    def open_entry_detail(self, item: QtGui.QStandardItem):
         condition = item.data(QtCore.Qt.ItemDataRole.UserRole)
         if not condition:
             return
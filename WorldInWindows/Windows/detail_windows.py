@@ -1,37 +1,121 @@
 from PyQt6 import QtCore, QtGui, QtWidgets
 from pathlib import Path
+from functools import lru_cache
 import json
 
 from ..theme import DMHelperTheme
 from ..knowledge_base import KnowledgeBase
-from ..repo import Repo
+from ..repo import get_shared_repo, update_json_record
 from ..config import Config
+from ..workers import run_in_background
 
 from ..Dataclasses import Spell, Item, ClassAction, NPC, Location, PcClass, PcClassName, StatBlock, MonsterManual, Condition
 from ..Dialogs import AddNPCDialog, CampaignNotesDialog, HoverPreview, EditPcClassDialog, AddSpellDialog, AddItemDialog, AddLocationDialog, AddConditionDialog
 from ..AIGen import ImageGenerator, ImageGenerationMode
 
-def _resolve_image_for_entry(config: Config, content_type: Spell | Item | ClassAction) -> Path | None:
-    if isinstance(content_type, Spell):
-        folder = config.get_spell_icons()
-    elif isinstance(content_type, Item):
-        folder = config.get_item_icons()
-    elif isinstance(content_type, ClassAction):
-        folder = config.get_ability_icons()
-    elif isinstance(content_type, NPC):
-        return _resolve_image_for_npc(config, content_type)
-    guess_file_name = content_type.name.replace(" ", "_").lower()
-    guess = folder / f"{guess_file_name}.png"
-    return guess if guess.exists() else None
+_FOLDER_BY_TYPE = {
+    Spell: Config.get_spell_icons,
+    Item: Config.get_item_icons,
+    ClassAction: Config.get_ability_icons,
+}
+
+def _resolve_image_for_entry(config: Config, content_type: Spell | Item | ClassAction | NPC) -> Path | None:
+    get_folder = _FOLDER_BY_TYPE.get(type(content_type))
+    if get_folder is None:
+        # NPCs have their own portrait rules; anything else (e.g. a Condition) has no icon folder
+        return _resolve_image_for_npc(config, content_type) if isinstance(content_type, NPC) else None
+    return _find_image(get_folder(config), _image_stem(content_type.name))
 
 def _resolve_image_for_npc(config: Config, npc) -> Path | None:
-    for attr in ("portrait_path", "image_path"):
-        p = getattr(npc, attr, None)
-        if p and Path(p).exists():
-            return Path(p)
-    guess_file_name = npc.name.replace(" ", "_").lower()
-    guess = config.get_npc_portraits() / f"{guess_file_name}.png"
-    return guess if guess.exists() else None
+    for explicit in (getattr(npc, "portrait_path", None), getattr(npc, "image_path", None)):
+        if explicit and Path(explicit).exists():
+            return Path(explicit)
+    return _find_image(config.get_npc_portraits(), _image_stem(npc.name))
+
+def _image_stem(name: str) -> str:
+    return name.replace(" ", "_").lower()
+
+def _find_image(folder: Path, stem: str) -> Path | None:
+    path = _image_index(folder).get(stem)
+    if path is None:
+        # An image written within the folder's mtime granularity wouldn't be indexed yet
+        candidate = folder / f"{stem}.png"
+        if candidate.exists():
+            path = candidate
+    return path
+
+def _folder_mtime(folder: Path) -> int:
+    try:
+        return folder.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+def _image_index(folder: Path) -> dict[str, Path]:
+    """Map of lowercased file stem -> path for the .png images (any suffix case) in folder."""
+    return _scan_image_folder(folder, _folder_mtime(folder))
+
+@lru_cache(maxsize=16)
+def _scan_image_folder(folder: Path, folder_mtime: int) -> dict[str, Path]:
+    # folder_mtime is only part of the cache key: adding or removing an image
+    # (e.g. a generated portrait) changes it and triggers a rescan
+    # iterdir + suffix check rather than glob("*.png"), which is case-sensitive (Foo.PNG)
+    try:
+        return {p.stem.lower(): p for p in folder.iterdir() if p.suffix.lower() == ".png"}
+    except OSError:
+        return {}
+
+@lru_cache(maxsize=1)
+def _trait_formats() -> tuple[QtGui.QTextBlockFormat, QtGui.QTextCharFormat]:
+    """Block/char formats matching the first trait's 12pt, 1.35 line-height div, for appended traits."""
+    block_fmt = QtGui.QTextBlockFormat()
+    block_fmt.setLineHeight(135.0, QtGui.QTextBlockFormat.LineHeightTypes.ProportionalHeight.value)
+    char_fmt = QtGui.QTextCharFormat()
+    char_fmt.setFontPointSize(12)
+    return block_fmt, char_fmt
+
+def _pixmap_key(path: Path, width: int) -> str | None:
+    try:
+        mtime = path.stat().st_mtime_ns  # A regenerated portrait gets a fresh entry
+    except OSError:
+        return None
+    return f"{path}|{width}|{mtime}"
+
+def _read_scaled_image(path: str, width: int) -> QtGui.QImage:
+    # Runs on a pool thread: QImage, unlike QPixmap, may be built off the UI thread,
+    # and the reader scales while decoding rather than decoding at full size first
+    reader = QtGui.QImageReader(path)
+    size = reader.size()
+    if size.isValid() and size.width() > 0:
+        reader.setScaledSize(QtCore.QSize(width, max(1, round(size.height() * width / size.width()))))
+    return reader.read()
+
+def _set_scaled_pixmap(label: QtWidgets.QLabel, path: Path, width: int):
+    """
+    Show path scaled to width in label, reusing QPixmapCache across windows.
+    On a cache miss the image is decoded on the thread pool; keep the returned worker referenced.
+    """
+    key = _pixmap_key(path, width)
+    if key is None:
+        label.hide()
+        return None
+    pix = QtGui.QPixmapCache.find(key)
+    if pix is not None and not pix.isNull():
+        label.setPixmap(pix)
+        return None
+
+    def show_image(image: QtGui.QImage):
+        try:
+            if image.isNull():
+                label.hide()
+                return
+            pix = QtGui.QPixmap.fromImage(image)
+            QtGui.QPixmapCache.insert(key, pix)
+            label.setPixmap(pix)
+        except RuntimeError:
+            pass  # The window closed before the image was ready
+
+    label.setText("Loading image…")
+    return run_in_background(_read_scaled_image, str(path), width, on_done=show_image)
 
 class QFormDetailWindowBase(QtWidgets.QMainWindow):
     form: QtWidgets.QFormLayout
@@ -56,20 +140,18 @@ class QFormDetailWindowBase(QtWidgets.QMainWindow):
         self.form.setFieldGrowthPolicy(QtWidgets.QFormLayout.FieldGrowthPolicy.AllNonFixedFieldsGrow)
         self.form.setRowWrapPolicy(QtWidgets.QFormLayout.RowWrapPolicy.WrapLongRows)
 
+        self.image_label: QtWidgets.QLabel | None = None
+        self.generate_btn: QtWidgets.QPushButton | None = None
         if not isinstance(entry, Condition):
             icon_path = _resolve_image_for_entry(self.config, entry)
             if icon_path:
-                img_label = QtWidgets.QLabel()
-                img_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignHCenter)
-                pix = QtGui.QPixmap(str(icon_path))
-                if not pix.isNull():
-                    img_label.setPixmap(pix.scaledToWidth(150, QtCore.Qt.TransformationMode.SmoothTransformation))
-                    self.form.addRow(None, img_label)
+                self.image_label = self.image_row_label(icon_path)
+                self.form.addRow(None, self.image_label)
             elif isinstance(entry, NPC):
-                generate_btn = QtWidgets.QPushButton("Generate Portrait")
-                generate_btn.setToolTip("Generate an AI portrait for this NPC")
-                generate_btn.clicked.connect(self.generate_portrait)    # This is a bit weird but works
-                self.form.addRow(None, generate_btn)
+                self.generate_btn = QtWidgets.QPushButton("Generate Portrait")
+                self.generate_btn.setToolTip("Generate an AI portrait for this NPC")
+                self.generate_btn.clicked.connect(self.generate_portrait)    # This is a bit weird but works
+                self.form.addRow(None, self.generate_btn)
 
         scroll.setWidget(content)
 
@@ -88,6 +170,12 @@ class QFormDetailWindowBase(QtWidgets.QMainWindow):
         layout.addWidget(self.buttons)
         self.setCentralWidget(central_widget)
 
+    def image_row_label(self, icon_path: Path) -> QtWidgets.QLabel:
+        img_label = QtWidgets.QLabel()
+        img_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignHCenter)
+        self._image_loader = _set_scaled_pixmap(img_label, icon_path, 150)
+        return img_label
+
     def edit_entry(self):
         pass
 
@@ -159,29 +247,16 @@ class NPCDetailWindow(QFormDetailWindowBase):
         self.npc = npc
         super().__init__(npc, kb, parent)
 
-        self.form.addRow("<b>Name:</b>", self.label(npc.name))
-        self.form.addRow("<b>Race:</b>", self.label(npc.race.value))
-        self.form.addRow("<b>Sex:</b>", self.label(npc.sex))
-        self.form.addRow("<b>Age:</b>", self.label(npc.age))
-        self.form.addRow("<b>Alignment:</b>", self.label(npc.alignment.value))
-
-        status_label = self.label("Alive ✓" if npc.alive else "Deceased ☠️")
-        if not npc.alive:
-            status_label.setStyleSheet("color: #cc0000; font-weight: bold;")
-        else:
-            status_label.setStyleSheet("color: #00aa00; font-weight: bold;")
-        self.form.addRow("<b>Status:</b>", status_label)
-
-        self.form.addRow("<b>Appearance:</b>", self.label(npc.appearance or ""))
-        self.form.addRow("<b>Personality:</b>", self.label(npc.personality or ""))
-        self.form.addRow("<b>Backstory:</b>", self.label(npc.backstory or ""))
+        # Labels are kept so refresh() can update them in place
+        self.field_labels: dict[str, QtWidgets.QLabel] = {}
+        for field_name in ("Name", "Race", "Sex", "Age", "Alignment", "Status", "Appearance", "Personality", "Backstory"):
+            self.field_labels[field_name] = self.label("")
+            self.form.addRow(f"<b>{field_name}:</b>", self.field_labels[field_name])
 
-        sb = npc.stat_block
-        sb_text = sb.display_name if sb else "None"
-        self.stat_btn = QtWidgets.QPushButton(sb_text)
-        self.stat_btn.setEnabled(sb is not None)
+        self.stat_btn = QtWidgets.QPushButton()
         self.stat_btn.clicked.connect(self.open_statblock)
         self.form.addRow("<b>Stat Block:</b>", self.stat_btn)
+        self.refresh_fields()
                 
         campaign_notes_btn = QtWidgets.QPushButton("Campaign Notes")
         campaign_notes_btn.clicked.connect(self.open_campaign_notes)
@@ -231,7 +306,7 @@ class NPCDetailWindow(QFormDetailWindowBase):
                 QtWidgets.QMessageBox.information(self, "Success", 
                     f"Portrait generated successfully for {self.npc.name}!")
                 
-                self.reload_window()
+                self.refresh()
             else:
                 QtWidgets.QMessageBox.warning(self, "Error", 
                     "Portrait generation completed but image file was not found. Please check the Media/NPCs directory.")
@@ -246,18 +321,59 @@ class NPCDetailWindow(QFormDetailWindowBase):
     def edit_entry(self):
         dialog = AddNPCDialog(self, edit_npc=self.npc)
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
-            # Reload the window to show updated NPC data
-            self.reload_window()
+            # The dialog saves a new NPC object; show that one rather than the pre-edit copy
+            if dialog.saved_npc is not None:
+                self.npc = self.entry = dialog.saved_npc
+            self.refresh()
+
+    def refresh_fields(self):
+        npc = self.npc
+        texts = {
+            "Name": npc.name,
+            "Race": npc.race.value,
+            "Sex": npc.sex,
+            "Age": npc.age,
+            "Alignment": npc.alignment.value,
+            "Status": "Alive ✓" if npc.alive else "Deceased ☠️",
+            "Appearance": npc.appearance or "",
+            "Personality": npc.personality or "",
+            "Backstory": npc.backstory or "",
+        }
+        for field_name, text in texts.items():
+            self.field_labels[field_name].setText(text)
+        if not npc.alive:
+            self.field_labels["Status"].setStyleSheet("color: #cc0000; font-weight: bold;")
+        else:
+            self.field_labels["Status"].setStyleSheet("color: #00aa00; font-weight: bold;")
 
-    def reload_window(self):
-        """Reload the NPC detail window to show updated portrait"""
-        geometry = self.geometry()
-        
-        new_window = NPCDetailWindow(self.npc, self.kb, self.parent())
-        new_window.setGeometry(geometry)  # Keep same position/size
-        new_window.show()
-        
-        self.close()
+        sb = npc.stat_block
+        self.stat_btn.setText(sb.display_name if sb else "None")
+        self.stat_btn.setEnabled(sb is not None)
+
+    def refresh_portrait(self):
+        portrait_path = _resolve_image_for_npc(self.config, self.npc)
+        if not portrait_path:
+            if self.image_label is not None:
+                # e.g. renamed to an NPC without a portrait: don't keep showing the old one
+                self.image_label.clear()
+                self.image_label.hide()
+            return
+        if self.generate_btn is not None:
+            # First portrait: it takes the Generate button's row
+            row, _ = self.form.getWidgetPosition(self.generate_btn)
+            self.form.removeRow(row)
+            self.generate_btn = None
+            self.image_label = self.image_row_label(portrait_path)
+            self.form.insertRow(row, None, self.image_label)
+        elif self.image_label is not None:
+            self.image_label.show()
+            self._image_loader = _set_scaled_pixmap(self.image_label, portrait_path, 150)
+
+    def refresh(self):
+        """Show updated NPC data and portrait, updating this window's widgets in place"""
+        self.setWindowTitle(f"{self.npc.__class__.__name__} — {self.npc.name}")
+        self.refresh_fields()
+        self.refresh_portrait()
 
     def open_campaign_notes(self):
         """Open the campaign notes dialog for this NPC"""
@@ -291,7 +407,7 @@ class NPCDetailWindow(QFormDetailWindowBase):
                     if len(npcs_data) < original_count:
                         # NPC was found and removed
                         with open(npcs_file, 'w', encoding='utf-8') as f:
-                            json.dump(npcs_data, f, indent=2, ensure_ascii=False)
+                            f.write(json.dumps(npcs_data, indent=2, ensure_ascii=False))
                         
                         QtWidgets.QMessageBox.information(
                             self,
@@ -323,6 +439,39 @@ class NPCDetailWindow(QFormDetailWindowBase):
                     f"Failed to delete NPC:\n{str(e)}"
                 )
 
+_LOCATION_NPC_ROW_STYLE = """
+    QPushButton#npcButton {
+        text-align: left;
+        padding: 8px;
+        margin: 2px 0;
+        border: 1px solid #666;
+        border-radius: 4px;
+        background-color: #ffffff;
+        color: #2c3e50;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QPushButton#npcButton:hover {
+        background-color: #e8f4f8;
+        border-color: #3498db;
+        color: #1e3a5f;
+    }
+    QPushButton#npcButton:pressed {
+        background-color: #d6eaf8;
+    }
+    QPushButton#removeNpcButton {
+        background-color: #ff6b6b;
+        color: white;
+        border: none;
+        border-radius: 3px;
+        padding: 5px;
+        margin: 2px 0;
+    }
+    QPushButton#removeNpcButton:hover {
+        background-color: #ff5252;
+    }
+"""
+
 class LocationDetailWindow(QtWidgets.QMainWindow):
     def __init__(self, location: Location, kb: KnowledgeBase, parent=None):
         super().__init__(parent)
@@ -341,6 +490,10 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
         vbox.setContentsMargins(12, 12, 12, 12)
         vbox.setSpacing(10)
 
+        # One bold font shared by every bold label
+        bold_font = content.font()
+        bold_font.setBold(True)
+
         def label(text: str, bold: bool = False):
             lab = QtWidgets.QLabel(text)
             lab.setWordWrap(True)
@@ -349,9 +502,7 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
                 QtCore.Qt.TextInteractionFlag.LinksAccessibleByMouse
             )
             if bold:
-                f = lab.font()
-                f.setBold(True)
-                lab.setFont(f)
+                lab.setFont(bold_font)
             return lab
 
         vbox.addWidget(label(location.name, bold=True))
@@ -362,64 +513,14 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
 
         vbox.addWidget(label("<b>NPCs in this Location:</b>", bold=True))
         
-        if location.npcs:
-            for npc in location.npcs:
-                # Create a horizontal layout for NPC name and remove button
-                npc_layout = QtWidgets.QHBoxLayout()
-                
-                # NPC name button (clickable to open details)
-                npc_item = QtWidgets.QPushButton(npc.name)
-                npc_item.setToolTip(npc.appearance or "")
-                npc_item.clicked.connect(lambda checked, n=npc: self.open_npc_detail(n))
-                npc_item.setStyleSheet("""
-                    QPushButton {
-                        text-align: left;
-                        padding: 8px;
-                        margin: 2px 0;
-                        border: 1px solid #666;
-                        border-radius: 4px;
-                        background-color: #ffffff;
-                        color: #2c3e50;
-                        font-weight: bold;
-                        font-size: 12px;
-                    }
-                    QPushButton:hover {
-                        background-color: #e8f4f8;
-                        border-color: #3498db;
-                        color: #1e3a5f;
-                    }
-                    QPushButton:pressed {
-                        background-color: #d6eaf8;
-                    }
-                """)
-                npc_layout.addWidget(npc_item)
-                
-                # Remove button
-                remove_btn = QtWidgets.QPushButton("Remove")
-                remove_btn.setToolTip(f"Remove {npc.name} from this location")
-                remove_btn.clicked.connect(lambda checked, n=npc: self.remove_npc_from_location(n))
-                remove_btn.setMaximumWidth(70)
-                remove_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #ff6b6b;
-                        color: white;
-                        border: none;
-                        border-radius: 3px;
-                        padding: 5px;
-                        margin: 2px 0;
-                    }
-                    QPushButton:hover {
-                        background-color: #ff5252;
-                    }
-                """)
-                npc_layout.addWidget(remove_btn)
-                
-                # Create widget to hold the layout
-                npc_widget = QtWidgets.QWidget()
-                npc_widget.setLayout(npc_layout)
-                vbox.addWidget(npc_widget)
-        else:
-            vbox.addWidget(label("No NPCs in this location"))
+        # Rebuilt in place when NPCs are added or removed; see _rebuild_npc_list
+        npc_list_widget = QtWidgets.QWidget()
+        # The row buttons' style is parsed once here rather than per button
+        npc_list_widget.setStyleSheet(_LOCATION_NPC_ROW_STYLE)
+        self.npc_list_layout = QtWidgets.QVBoxLayout(npc_list_widget)
+        self.npc_list_layout.setContentsMargins(0, 0, 0, 0)
+        vbox.addWidget(npc_list_widget)
+        self._rebuild_npc_list()
 
         vbox.addSpacing(10)
 
@@ -493,31 +594,73 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
             self.refresh_window()
 
+    def _rebuild_npc_list(self):
+        """(Re)build the NPC rows from self.location.npcs"""
+        while self.npc_list_layout.count():
+            widget = self.npc_list_layout.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+
+        if self.location.npcs:
+            for npc in self.location.npcs:
+                # Create a horizontal layout for NPC name and remove button
+                npc_layout = QtWidgets.QHBoxLayout()
+                
+                # NPC name button (clickable to open details)
+                npc_item = QtWidgets.QPushButton(npc.name)
+                npc_item.setToolTip(npc.appearance or "")
+                npc_item.clicked.connect(lambda checked, n=npc: self.open_npc_detail(n))
+                npc_item.setObjectName("npcButton")
+                npc_layout.addWidget(npc_item)
+                
+                # Remove button
+                remove_btn = QtWidgets.QPushButton("Remove")
+                remove_btn.setToolTip(f"Remove {npc.name} from this location")
+                remove_btn.clicked.connect(lambda checked, n=npc: self.remove_npc_from_location(n))
+                remove_btn.setMaximumWidth(70)
+                remove_btn.setObjectName("removeNpcButton")
+                npc_layout.addWidget(remove_btn)
+                
+                # Create widget to hold the layout
+                npc_widget = QtWidgets.QWidget()
+                npc_widget.setLayout(npc_layout)
+                self.npc_list_layout.addWidget(npc_widget)
+        else:
+            empty_label = QtWidgets.QLabel("No NPCs in this location")
+            empty_label.setWordWrap(True)
+            self.npc_list_layout.addWidget(empty_label)
+
     def populate_npc_dropdown(self):
         """Populate dropdown with NPCs not already in this location"""
         self.npc_dropdown.clear()
+        self.npc_dropdown.addItem("Loading NPCs…", None)
+        # get_shared_repo may wait on a browser's load or re-read changed files, so keep it off the UI thread
+        data_dir = self.config.data_dir
+        self._npc_loader = run_in_background(lambda: list(get_shared_repo(data_dir).npcs),
+                                             on_done=self._fill_npc_dropdown, on_error=self._on_npcs_failed)
+
+    def _fill_npc_dropdown(self, all_npcs: list):
+        self._npc_loader = None
+        self.npc_dropdown.clear()
+
+        existing_npc_names = {npc.name for npc in self.location.npcs}
         
-        try:
-            repo = Repo(self.config.data_dir)
-            repo.load_all()
-            all_npcs = list(repo.npcs)
-            
-            existing_npc_names = {npc.name for npc in self.location.npcs}
-            
-            available_npcs = [npc for npc in all_npcs if npc.name not in existing_npc_names]
-            
-            if not available_npcs:
-                self.npc_dropdown.addItem("No NPCs available to add", None)
-                return
-                
-            available_npcs.sort(key=lambda x: x.name.lower())
+        available_npcs = [npc for npc in all_npcs if npc.name not in existing_npc_names]
+        
+        if not available_npcs:
+            self.npc_dropdown.addItem("No NPCs available to add", None)
+            return
             
-            for npc in available_npcs:
-                self.npc_dropdown.addItem(npc.name, npc)
-                
-        except Exception as e:
-            print(f"Error loading NPCs: {e}")
-            self.npc_dropdown.addItem("Error loading NPCs", None)
+        available_npcs.sort(key=lambda x: x.name.lower())
+        
+        for npc in available_npcs:
+            self.npc_dropdown.addItem(npc.name, npc)
+
+    def _on_npcs_failed(self, error: str):
+        self._npc_loader = None
+        print(f"Error loading NPCs: {error}")
+        self.npc_dropdown.clear()
+        self.npc_dropdown.addItem("Error loading NPCs", None)
 
     def add_npc_to_location(self):
         """Add selected NPC to this location"""
@@ -541,7 +684,8 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.information(self, "NPC Added", 
                 f"'{npc.name}' has been added to '{self.location.name}'.")
             
-            self.refresh_window()
+            self._rebuild_npc_list()
+            self.populate_npc_dropdown()
             
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Error", 
@@ -565,14 +709,15 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.information(self, "NPC Removed", 
                     f"'{npc.name}' has been removed from '{self.location.name}'.")
                 
-                # Refresh the window to show the updated list
-                self.refresh_window()
+                # Update the NPC rows and the dropdown to show the change
+                self._rebuild_npc_list()
+                self.populate_npc_dropdown()
                 
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Error", 
                     f"Failed to remove NPC from location:\n{str(e)}")
 
-    def open_npc_detail(self, npc):
+    def open_npc_detail(self, npc: NPC):
         """Open the NPC detail window"""
         window = NPCDetailWindow(npc, self.kb, self)
         window.show()
@@ -601,25 +746,16 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
             if not locations_file.exists():
                 raise Exception("Locations file not found")
             
-            # Load existing locations data
-            with open(locations_file, 'r', encoding='utf-8') as f:
-                locations_data = json.load(f)
-            
-            # Find and update the location entry
-            location_updated = False
-            for loc_entry in locations_data:
-                # Match by name (locations should have unique names)
-                if loc_entry.get("name") == self.location.name:
-                    loc_entry["npcs"] = [npc.name for npc in self.location.npcs]
-                    location_updated = True
-                    break
+            def set_npcs(loc_entry: dict):
+                loc_entry["npcs"] = [npc.name for npc in self.location.npcs]
+
+            # Find and update the location entry, matched by name (locations should have unique names);
+            # only that entry is re-encoded
+            location_updated = update_json_record(
+                locations_file, lambda loc_entry: loc_entry.get("name") == self.location.name, set_npcs)
             
             if not location_updated:
                 raise Exception(f"Could not find location '{self.location.name}' in the data file")
-            
-            # Save back to file
-            with open(locations_file, 'w', encoding='utf-8') as f:
-                json.dump(locations_data, f, indent=2, ensure_ascii=False)
                 
         except Exception as e:
             print(f"Error saving locations: {e}")
@@ -627,11 +763,6 @@ class LocationDetailWindow(QtWidgets.QMainWindow):
             # QtWidgets.QMessageBox.warning(self, "Save Error", 
             #     f"Could not save changes to locations file:\n{str(e)}")
 
-    def open_npc_detail(self, npc: NPC):
-        """Open the NPC detail window"""
-        window = NPCDetailWindow(npc, self.kb, self)
-        window.show()
-
 class ConditionDetailWindow(QFormDetailWindowBase):
     def __init__(self, condition, kb: KnowledgeBase, parent=None):
         self.condition = condition
@@ -645,6 +776,24 @@ class ConditionDetailWindow(QFormDetailWindowBase):
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
             self.reload_window()
 
+_SPELL_SLOT_STYLE = """
+    QCheckBox#spellSlot::indicator {
+        width: 16px;
+        height: 16px;
+        border: 2px solid #555;
+        border-radius: 3px;
+        background-color: transparent;
+    }
+    QCheckBox#spellSlot::indicator:checked {
+        background-color: #4A90E2;
+        border: 2px solid #357ABD;
+    }
+    QCheckBox#spellSlot::indicator:unchecked {
+        background-color: transparent;
+        border: 2px solid #555;
+    }
+"""
+
 class StatBlockDetailWindow(QtWidgets.QMainWindow):
     def __init__(self, sb: StatBlock, kb: KnowledgeBase, traits: list | None = None, parent=None):
         super().__init__(parent)
@@ -652,6 +801,14 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
         self.sb = sb
         self.kb = kb
         self.traits = traits if traits is not None else []
+        # (text browser, html, append) filled in after the window is shown; see _flush_pending_html
+        self._pending_html: list[tuple[QtWidgets.QTextBrowser, str, bool]] = []
+        # Monster page rescaling: coalesced while resizing, skipped if the width didn't change
+        self._last_scaled_w = -1
+        self._rescale_timer = QtCore.QTimer(self)
+        self._rescale_timer.setSingleShot(True)
+        self._rescale_timer.setInterval(50)
+        self._rescale_timer.timeout.connect(self._rescale_image)
         
         DMHelperTheme.apply_theme(self)
         
@@ -670,6 +827,10 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
         vbox.setContentsMargins(12, 12, 12, 12)
         vbox.setSpacing(10)
 
+        # One bold font shared by every bold label
+        bold_font = content.font()
+        bold_font.setBold(True)
+
         def label(text: str, bold: bool = False):
             lab = QtWidgets.QLabel(text)
             lab.setWordWrap(True)
@@ -678,9 +839,7 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
                 QtCore.Qt.TextInteractionFlag.LinksAccessibleByMouse
             )
             if bold:
-                f = lab.font()
-                f.setBold(True)
-                lab.setFont(f)
+                lab.setFont(bold_font)
             return lab
         
         def field_label(field_name: str, value: str):
@@ -771,6 +930,8 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
             spell_slots = getattr(sb, "spell_slots", [])
             if spell_slots:
                 vbox.addWidget(section_heading("Spell Slots"))
+                # Parsed once here rather than per checkbox
+                content.setStyleSheet(_SPELL_SLOT_STYLE)
                 mage_armor_cast = False
                 if sb.name == PcClassName.Wizard or sb.name == PcClassName.Sorcerer:
                     mage_armor_cast = "Mage Armor" in spells
@@ -790,23 +951,7 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
                         else:
                             checkbox.setChecked(True)  # Start all slots as available (checked/blue)
                         
-                        checkbox.setStyleSheet("""
-                            QCheckBox::indicator {
-                                width: 16px;
-                                height: 16px;
-                                border: 2px solid #555;
-                                border-radius: 3px;
-                                background-color: transparent;
-                            }
-                            QCheckBox::indicator:checked {
-                                background-color: #4A90E2;
-                                border: 2px solid #357ABD;
-                            }
-                            QCheckBox::indicator:unchecked {
-                                background-color: transparent;
-                                border: 2px solid #555;
-                            }
-                        """)
+                        checkbox.setObjectName("spellSlot")  # styled by _SPELL_SLOT_STYLE on content
                         
                         slot_layout.addWidget(checkbox)
                     
@@ -815,20 +960,8 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
 
             vbox.addWidget(section_heading("Weapons"))
             weapons_text = ', '.join(weapons) if weapons else 'None'
-            weapons_tb = QtWidgets.QTextBrowser()
-            weapons_tb.setOpenExternalLinks(False)
-            weapons_tb.setOpenLinks(False)
-            weapons_tb.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
-            weapons_tb.setReadOnly(True)
-            weapons_tb.setAcceptRichText(True)
-            weapons_tb.setMouseTracking(True)
-            weapons_tb.viewport().setMouseTracking(True)
-            
             html = self.kb.linkify(weapons_text)
-            weapons_tb.setHtml(f"<div style='font-size: 12pt; line-height: 1.35'>{html}</div>")
-            weapons_tb.anchorClicked.connect(self._on_anchor_clicked)
-            weapons_tb.highlighted.connect(self._on_link_hovered)
-            vbox.addWidget(weapons_tb)
+            vbox.addWidget(self._link_label(f"<div style='font-size: 12pt; line-height: 1.35'>{html}</div>"))
 
             vbox.addWidget(section_heading("Spells"))
             if not spells:
@@ -849,20 +982,8 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
                     </tr>
                 </table>
                 """
-            
-            spells_tb = QtWidgets.QTextBrowser()
-            spells_tb.setOpenExternalLinks(False)
-            spells_tb.setOpenLinks(False)
-            spells_tb.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
-            spells_tb.setReadOnly(True)
-            spells_tb.setAcceptRichText(True)
-            spells_tb.setMouseTracking(True)
-            spells_tb.viewport().setMouseTracking(True)
-            
-            spells_tb.setHtml(f"<div style='font-size: 12pt; line-height: 1.35'>{spells_text}</div>")
-            spells_tb.anchorClicked.connect(self._on_anchor_clicked)
-            spells_tb.highlighted.connect(self._on_link_hovered)
-            vbox.addWidget(spells_tb)
+
+            vbox.addWidget(self._link_label(f"<div style='font-size: 12pt; line-height: 1.35'>{spells_text}</div>"))
 
         elif isinstance(sb, MonsterManual):
             vbox.addWidget(label("Monster Manual Entry", bold=True))
@@ -875,15 +996,19 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
             img_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignHCenter)
             if sb_image:
                 sb_image_path = self.config.get_monster_manual_pages() / sb_image
-                pix = QtGui.QPixmap(str(sb_image_path))
-                if not pix.isNull():
-                    # scale-to-fit width while keeping aspect
-                    img_label.setPixmap(pix)
-                    # We'll scale after widget shows (see resizeEvent override below)
-                    self._image_label = img_label
-                    self._image_pixmap = pix
-                else:
+                # Full-size page, shared through QPixmapCache so reopening doesn't decode again
+                key = _pixmap_key(sb_image_path, 0)
+                pix = QtGui.QPixmapCache.find(key) if key else None
+                if pix is not None and not pix.isNull():
+                    self._show_monster_page(img_label, pix)
+                elif key is None:
                     img_label.setText(f"(Image not found or failed to load)\n{sb_image_path}")
+                else:
+                    # Decode on the thread pool so the window opens straight away
+                    img_label.setText("Loading image…")
+                    self._image_loader = run_in_background(
+                        QtGui.QImage, str(sb_image_path),
+                        on_done=lambda image: self._on_monster_page_loaded(img_label, key, sb_image_path, image))
             else:
                 img_label.setText("(No image path specified)")
             vbox.addWidget(img_label)
@@ -908,14 +1033,15 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
             tb.setMouseTracking(True)  # needed for hover events
             tb.viewport().setMouseTracking(True)
 
-            combined_html = ""
-            for i, t in enumerate(self.traits):
-                html = self.kb.linkify(t)
-                if i > 0:
-                    combined_html += "<br><br>"
-                combined_html += html
-            
-            tb.setHtml(f"<div style='font-size: 12pt; line-height: 1.35'>{combined_html}</div>")
+            # One document for all traits rather than a browser each. The first trait
+            # sets it and the rest are appended one at a time, so no single step has
+            # to lay out the whole document. Appended traits are inline spans: insertHtml
+            # drops block-level styles, so their line height comes from _trait_formats().
+            first, *rest = self.traits
+            self._pending_html.append(
+                (tb, f"<div style='font-size: 12pt; line-height: 1.35'>{self.kb.linkify(first)}</div>", False))
+            for t in rest:
+                self._pending_html.append((tb, f"<span style='font-size: 12pt'>{self.kb.linkify(t)}</span>", True))
             tb.anchorClicked.connect(self._on_anchor_clicked)
             tb.highlighted.connect(self._on_link_hovered)  # hover signal gives URL as text
             vbox.addWidget(tb)
@@ -936,6 +1062,27 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
         layout.addWidget(btns)
         
         self.setCentralWidget(central_widget)
+        # Lay out the rich text once the window is up, so it opens without waiting on it
+        if self._pending_html:
+            QtCore.QTimer.singleShot(0, self._flush_pending_html)
+
+    def _flush_pending_html(self):
+        """Set or append one pending piece of text browser HTML, then queue the next."""
+        if not self._pending_html:
+            return
+        tb, html, append = self._pending_html.pop(0)
+        if append:
+            cursor = QtGui.QTextCursor(tb.document())
+            cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+            block_fmt, char_fmt = _trait_formats()
+            # Blank line between traits, then the trait's own block
+            cursor.insertBlock(block_fmt, char_fmt)
+            cursor.insertBlock(block_fmt, char_fmt)
+            cursor.insertHtml(html)
+        else:
+            tb.setHtml(html)
+        if self._pending_html:
+            QtCore.QTimer.singleShot(0, self._flush_pending_html)
 
     def _plain_label(self, text: str) -> QtWidgets.QLabel:
         lab = QtWidgets.QLabel(text)
@@ -944,6 +1091,18 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
                                     QtCore.Qt.TextInteractionFlag.LinksAccessibleByMouse)
         return lab
 
+    def _link_label(self, html: str) -> QtWidgets.QLabel:
+        """Rich-text label for short linkified fields; links behave as in the text browsers."""
+        lab = QtWidgets.QLabel(html)
+        lab.setTextFormat(QtCore.Qt.TextFormat.RichText)
+        lab.setWordWrap(True)
+        lab.setOpenExternalLinks(False)
+        lab.setTextInteractionFlags(QtCore.Qt.TextInteractionFlag.TextSelectableByMouse |
+                                    QtCore.Qt.TextInteractionFlag.LinksAccessibleByMouse)
+        lab.linkActivated.connect(lambda link: self._on_anchor_clicked(QtCore.QUrl(link)))
+        lab.linkHovered.connect(lambda link: self._on_link_hovered(QtCore.QUrl(link)))
+        return lab
+
     def _bold_label(self, text: str) -> QtWidgets.QLabel:
         """Create a section heading label with enhanced styling"""
         lab = QtWidgets.QLabel(text)
@@ -970,7 +1129,7 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
             self._hover.hide()
             return
         pos = QtGui.QCursor.pos()
-        self._hover.show_text(entry.hover_description, pos)
+        self._hover.show_text(self.kb.hover_html(entry), pos)
 
     def _on_anchor_clicked(self, url: QtCore.QUrl):
         name = url.toString()
@@ -1027,7 +1186,30 @@ class StatBlockDetailWindow(QtWidgets.QMainWindow):
         """Keep monster image scaled to width while preserving aspect ratio."""
         super().resizeEvent(event)
         if hasattr(self, "_image_label") and hasattr(self, "_image_pixmap"):
-            area_w = self.width() - 64  # approximate padding
-            if area_w > 100:
-                scaled = self._image_pixmap.scaledToWidth(area_w, QtCore.Qt.TransformationMode.SmoothTransformation)
-                self._image_label.setPixmap(scaled)
+            self._rescale_timer.start()
+
+    def _on_monster_page_loaded(self, img_label: QtWidgets.QLabel, key: str, path: Path, image: QtGui.QImage):
+        try:
+            if image.isNull():
+                img_label.setText(f"(Image not found or failed to load)\n{path}")
+                return
+            pix = QtGui.QPixmap.fromImage(image)
+            QtGui.QPixmapCache.insert(key, pix)
+            self._show_monster_page(img_label, pix)
+        except RuntimeError:
+            pass  # The window closed before the page was ready
+
+    def _show_monster_page(self, img_label: QtWidgets.QLabel, pix: QtGui.QPixmap):
+        img_label.setPixmap(pix)
+        # Kept for resizeEvent, which scales the page to the window width
+        self._image_label = img_label
+        self._image_pixmap = pix
+        self._last_scaled_w = -1
+        self._rescale_image()
+
+    def _rescale_image(self):
+        area_w = self.width() - 64  # approximate padding
+        if area_w > 100 and area_w != self._last_scaled_w:
+            scaled = self._image_pixmap.scaledToWidth(area_w, QtCore.Qt.TransformationMode.SmoothTransformation)
+            self._image_label.setPixmap(scaled)
+            self._last_scaled_w = area_w
@@ -1,13 +1,16 @@
 from PyQt6 import QtCore, QtGui, QtWidgets
 from typing import List, Optional
 from pathlib import Path
+from collections import deque
+from array import array
 import sys
 
 from ..knowledge_base import KnowledgeBase  # HMMMM
-from ..repo import Repo
+from ..repo import Repo, reload_shared_repo
 from ..version import __version__, __release_date__
 
 from ..Dataclasses import Location, NPC
+from ..Dataclasses.location import trigram_bloom
 from ..Dialogs import PathConfigDialog
 
 from .browse_windows import NPCBrowserWindow, ItemBrowserWindow, SpellBrowserWindow, LocationBrowserWindow, ConditionBrowserWindow, SoundBrowserWindow
@@ -15,87 +18,203 @@ from .detail_windows import NPCDetailWindow, LocationDetailWindow
 
 # --- Tree model utilities ---
 ROLE_LOCATION_PTR = QtCore.Qt.ItemDataRole.UserRole + 1
-ROLE_NPC_PTR = QtCore.Qt.ItemDataRole.UserRole + 2
 
-def build_tree_model(locations: List[Location], all_locations: List[Location]) -> QtGui.QStandardItemModel:
+# Looked up once here rather than through the enum classes on every data()/flags() call
+_DISPLAY_ROLE = int(QtCore.Qt.ItemDataRole.DisplayRole)
+_TOOLTIP_ROLE = int(QtCore.Qt.ItemDataRole.ToolTipRole)
+_TREE_ROLES = frozenset((_DISPLAY_ROLE, _TOOLTIP_ROLE, int(ROLE_LOCATION_PTR)))
+_ROW_FLAGS = QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable
+_NO_FLAGS = QtCore.Qt.ItemFlag.NoItemFlags
+
+class LocationTreeModel(QtCore.QAbstractItemModel):
     """
-    Build a two-column tree:
+    Two-column tree over Location objects:
     Column 0: Location name
     Column 1: Short description
+    A location's child rows are only exposed once the view fetches them (on expand).
     """
-    model = QtGui.QStandardItemModel()
-    model.setHorizontalHeaderLabels(["Location", "Short Description"])
-
-    # Index by object to avoid duplicate insertion
-    top_level = [loc for loc in locations if loc.parent is None]
-
-    def make_item(loc: Location) -> List[QtGui.QStandardItem]:
-        name_item = QtGui.QStandardItem(loc.name)
-        name_item.setEditable(False)
-        name_item.setData(loc, ROLE_LOCATION_PTR)
-        # Tooltip with more detail
-        name_item.setToolTip(f"{loc.name}\n\n{loc.description}")
-
-        desc_item = QtGui.QStandardItem(loc.short_description(80))
-        desc_item.setEditable(False)
-        desc_item.setToolTip(loc.description)
-
-        return [name_item, desc_item]
-
-    def add_node(parent_item: Optional[QtGui.QStandardItem], loc: Location):
-        items = make_item(loc)
-        if parent_item is None:
-            model.appendRow(items)
-        else:
-            parent_item.appendRow(items)
-        # Recurse for children
-        children = loc.get_children(all_locations)
-        for child in children:
-            add_node(items[0], child)
-
-    for loc in top_level:
-        add_node(None, loc)
-
-    return model
-
-def filter_tree(tree_view: QtWidgets.QTreeView, model: QtGui.QStandardItemModel, text: str):
+    HEADERS = ("Location", "Short Description")
+
+    def __init__(self, roots: List[Location], parent=None):
+        # roots is the Repo's precomputed top_level_locations; no need to rescan for parent is None
+        super().__init__(parent)
+        self.roots = list(roots)
+        self._rows: dict[int, int] = {id(loc): row for row, loc in enumerate(self.roots)}
+        self._fetched: set[int] = set()  # ids of locations whose children are exposed
+
+        # Flat, parent-before-child arrays over the whole tree, for filtering
+        self._flat: List[Location] = []
+        parent_idx = []
+        stack = [(loc, -1) for loc in reversed(self.roots)]
+        while stack:
+            loc, parent = stack.pop()
+            parent_idx.append(parent)
+            self._flat.append(loc)
+            here = len(self._flat) - 1
+            stack.extend((child, here) for child in reversed(loc.children))
+        self._parent_idx = array('i', parent_idx)
+        self._hays = [loc.search_hay for loc in self._flat]
+        self._blooms = [loc.hay_bloom for loc in self._flat]
+
+    # --- Lookup helpers ---
+    def location(self, index: QtCore.QModelIndex) -> Optional[Location]:
+        return index.internalPointer() if index.isValid() else None
+
+    def index_of(self, loc: Location, column: int = 0) -> QtCore.QModelIndex:
+        row = self._rows.get(id(loc))
+        if row is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, loc)
+
+    def fetch_all(self):
+        """Expose every row, e.g. before filtering the whole tree."""
+        stack = deque(self.roots)
+        while stack:
+            loc = stack.pop()
+            if loc.children and id(loc) not in self._fetched:
+                self.fetchMore(self.index_of(loc))
+            stack.extend(loc.children)
+
+    def matching_ids(self, needle: str, needle_bloom: int) -> set[int]:
+        """ids of the locations matching needle, plus all of their ancestors."""
+        # Any trigram of the needle missing from a location's bloom rules it out
+        hits = [(bloom & needle_bloom) == needle_bloom and needle in hay
+                for hay, bloom in zip(self._hays, self._blooms)]
+        # Children come after their parent, so one backwards pass reaches every ancestor
+        parent_idx = self._parent_idx
+        for i in range(len(hits) - 1, -1, -1):
+            if hits[i] and parent_idx[i] >= 0:
+                hits[parent_idx[i]] = True
+        return {id(loc) for loc, hit in zip(self._flat, hits) if hit}
+
+    # --- QAbstractItemModel interface ---
+    def index(self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        siblings = parent.internalPointer().children if parent.isValid() else self.roots
+        return self.createIndex(row, column, siblings[row])
+
+    def parent(self, index: QtCore.QModelIndex = None) -> QtCore.QModelIndex:
+        if index is None:
+            return super().parent()  # QObject.parent()
+        loc = self.location(index)
+        if loc is None or loc.parent is None:
+            return QtCore.QModelIndex()
+        return self.index_of(loc.parent)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return len(self.roots)
+        loc = parent.internalPointer()
+        return len(loc.children) if id(loc) in self._fetched else 0
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        if not parent.isValid():
+            return bool(self.roots)
+        return parent.column() == 0 and bool(parent.internalPointer().children)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        loc = self.location(parent)
+        return loc is not None and bool(loc.children) and id(loc) not in self._fetched
+
+    def fetchMore(self, parent: QtCore.QModelIndex):
+        loc = self.location(parent)
+        if loc is None or id(loc) in self._fetched or not loc.children:
+            return
+        self.beginInsertRows(parent, 0, len(loc.children) - 1)
+        self._fetched.add(id(loc))
+        for row, child in enumerate(loc.children):
+            self._rows[id(child)] = row
+        self.endInsertRows()
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        # The view asks for a dozen roles per cell on every paint; turn away
+        # the ones we don't serve before touching the index
+        if role not in _TREE_ROLES:
+            return None
+        loc = self.location(index)
+        if loc is None:
+            return None
+        if role == _DISPLAY_ROLE:
+            return loc.name if index.column() == 0 else loc.short_desc
+        if role == _TOOLTIP_ROLE:
+            # Tooltip with more detail
+            return f"{loc.name}\n\n{loc.description}" if index.column() == 0 else loc.description
+        return loc
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+        # Every row has the same flags, so there is nothing to compute or cache
+        return _ROW_FLAGS if index.isValid() else _NO_FLAGS
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+class LocationFilterProxy(QtCore.QSortFilterProxyModel):
     """
     Simple name/description filter that hides non-matching branches.
-    Shows a parent if any descendant matches.
+    A parent stays visible if any descendant matches.
     """
-    t = text.strip().lower()
-
-    def node_matches(item: QtGui.QStandardItem) -> bool:
-        loc: Location = item.data(ROLE_LOCATION_PTR)
-        if not loc:
-            return False
-        hay = " ".join([loc.name, loc.description, loc.region or "", " ".join(loc.tags)]).lower()
-        return (t in hay) if t else True
-
-    def apply(item: QtGui.QStandardItem) -> bool:
-        # Check self and children
-        match_self = node_matches(item)
-        any_child_match = False
-        for row in range(item.rowCount()):
-            child = item.child(row, 0)
-            if child:
-                child_match = apply(child)
-                any_child_match = any_child_match or child_match
-        
-        visible = match_self or any_child_match
-        
-        # Hide/show rows using the tree view
-        index = item.index()
-        if index.isValid():
-            tree_view.setRowHidden(index.row(), index.parent(), not visible)
-        
-        return visible
-
-    # Apply to all top-level nodes
-    for r in range(model.rowCount()):
-        root_item = model.item(r, 0)
-        if root_item:
-            apply(root_item)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._roots: List[Location] = []
+        self._visible: set[int] = set()  # ids of locations shown for the current needle
+
+    def setSourceModel(self, model: LocationTreeModel):
+        self._roots = model.roots
+        if self._needle:
+            self._visible = model.matching_ids(self._needle, trigram_bloom(self._needle))
+        super().setSourceModel(model)
+
+    def set_search_text(self, text: str):
+        needle = text.strip().casefold()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        if needle:
+            # Matches can sit under collapsed, not yet fetched branches
+            self.sourceModel().fetch_all()
+            # Ancestors of matches are worked out up front over the model's flat
+            # arrays, so Qt's recursive filtering (a Python call per row) isn't needed
+            self._visible = self.sourceModel().matching_ids(needle, trigram_bloom(needle))
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
+        if not self._needle:
+            return True
+        # Read the Location straight from the tree instead of building a source index
+        siblings = source_parent.internalPointer().children if source_parent.isValid() else self._roots
+        return id(siblings[source_row]) in self._visible
+
+def _npc_tooltip(npc: NPC) -> str:
+    appearance = npc.appearance or ""
+    if len(appearance) > 160:
+        appearance = appearance[:160].rstrip() + "…"
+    return (f"{npc.name}\n"
+            f"Race: {npc.race.value}\n"
+            f"Alignment: {npc.alignment.value}\n\n"
+            f"{appearance}")
+
+class NPCListItem(QtWidgets.QListWidgetItem):
+    """NPC list row whose hover tooltip is only built the first time it is shown."""
+    def __init__(self, npc: NPC):
+        super().__init__(npc.name)
+        self.npc = npc  # Plain attribute: no QVariant round trip when the row is opened
+        self._tooltip: Optional[str] = None
+
+    def data(self, role: int):
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            if self._tooltip is None:
+                self._tooltip = _npc_tooltip(self.npc)
+            return self._tooltip
+        return super().data(role)
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -125,24 +244,30 @@ class MainWindow(QtWidgets.QMainWindow):
         self.location_tree.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
         self.location_tree.setAlternatingRowColors(True)
         self.location_tree.setUniformRowHeights(True)
+        self.location_tree.setAnimated(False)
         self.location_tree.setExpandsOnDoubleClick(True)
         
         self.location_tree.doubleClicked.connect(self.open_location_detail)
 
         self.npc_list = QtWidgets.QListWidget()
         self.npc_list.itemDoubleClicked.connect(self.open_npc_detail)
+        # Rows are single lines of text, so Qt can size them all from the first
+        self.npc_list.setUniformItemSizes(True)
+        self.npc_list.setLayoutMode(QtWidgets.QListView.LayoutMode.Batched)
+        self.npc_list.setBatchSize(200)
+        self.npc_list.setMovement(QtWidgets.QListView.Movement.Static)
 
         # Create menu bar
         self.create_menu_bar()
 
         # Build model
-        all_locs = self.repo.get_all_locations()
-        self.model = build_tree_model(self.locations, all_locs)
-        self.proxy = QtCore.QSortFilterProxyModel()  # not filtering via proxy; we keep it for header resize behavior
+        self.model = LocationTreeModel(self.locations)
+        self.proxy = LocationFilterProxy(self)
         self.proxy.setSourceModel(self.model)
-        self.location_tree.setModel(self.model)
+        self.location_tree.setModel(self.proxy)
         self.location_tree.header().setStretchLastSection(False)
-        self.location_tree.header().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        # Sized once below rather than ResizeToContents, which rescans every row on each layout
+        self.location_tree.header().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Interactive)
         self.location_tree.header().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)
 
         # Layouts
@@ -167,13 +292,22 @@ class MainWindow(QtWidgets.QMainWindow):
         root_layout.addWidget(splitter)
         self.setCentralWidget(container)
 
+        # Debounce the search box so fast typing filters the tree once
+        self._pending_search = ""
+        self._last_search = ""
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._apply_search_filter)
+
         # Signals
         self.search.textChanged.connect(self.on_search_text_changed)
         self.location_tree.selectionModel().selectionChanged.connect(self.on_location_selected)
 
-        # Expand all to reveal nested nodes; select first if present
-        self.location_tree.expandAll()
-        first_index = self.model.index(0, 0)
+        # Expand the first level; deeper children are fetched as the user expands them
+        self.location_tree.expandToDepth(0)
+        self.location_tree.resizeColumnToContents(0)
+        first_index = self.proxy.index(0, 0)
         if first_index.isValid():
             self.location_tree.setCurrentIndex(first_index)
             self.on_location_selected()
@@ -181,17 +315,25 @@ class MainWindow(QtWidgets.QMainWindow):
         self.statusBar().showMessage("Select a location to see its NPCs. Hover a location for full description.")
 
     def on_search_text_changed(self, text: str):
-        filter_tree(self.location_tree, self.model, text)
-        # Keep expanded to show matching descendants
-        self.location_tree.expandAll()
+        self._pending_search = text
+        self._search_timer.start()
+
+    def _apply_search_filter(self):
+        text = self._pending_search.strip().casefold()
+        previous, self._last_search = self._last_search, text
+        self.location_tree.setUpdatesEnabled(False)
+        try:
+            self.proxy.set_search_text(text)
+            # Expand to show matching descendants. Narrowing a search (typing more)
+            # only removes rows, so the tree is already expanded as needed then.
+            if text and not (previous and text.startswith(previous)):
+                self.location_tree.expandAll()
+        finally:
+            self.location_tree.setUpdatesEnabled(True)
 
     def _index_to_location(self, index: QtCore.QModelIndex) -> Optional[Location]:
-        if not index.isValid():
-            return None
-        item = self.model.itemFromIndex(index.siblingAtColumn(0))
-        if not item:
-            return None
-        return item.data(ROLE_LOCATION_PTR)
+        # View indexes belong to the filter proxy
+        return self.model.location(self.proxy.mapToSource(index))
 
     def on_location_selected(self):
         indexes = self.location_tree.selectionModel().selectedIndexes()
@@ -209,37 +351,23 @@ class MainWindow(QtWidgets.QMainWindow):
     def populate_npcs(self, location: Location):
         self.npc_list.clear()
         for npc in location.npcs:
-            item = QtWidgets.QListWidgetItem(npc.name)
-            item.setData(ROLE_NPC_PTR, npc)
-            # Hover tooltip for NPC
-            tooltip = self._npc_tooltip(npc)
-            item.setToolTip(tooltip)
+            item = NPCListItem(npc)
             self.npc_list.addItem(item)
 
-    def open_npc_detail(self, item: QtWidgets.QListWidgetItem):
-        npc = item.data(ROLE_NPC_PTR)
+    def open_npc_detail(self, item: NPCListItem):
+        npc = item.npc
         if not npc:
             return
         window = NPCDetailWindow(npc, self.kb, self)
         window.show()
 
-    def open_location_detail(self, item: QtWidgets.QTreeWidgetItem):
-        loc = item.data(ROLE_LOCATION_PTR)
+    def open_location_detail(self, index: QtCore.QModelIndex):
+        loc = self._index_to_location(index)
         if not loc:
             return
         window = LocationDetailWindow(loc, self.kb, self)
         window.show()
 
-
-    def _npc_tooltip(self, npc: NPC) -> str:
-        appearance = npc.appearance or ""
-        if len(appearance) > 160:
-            appearance = appearance[:160].rstrip() + "…"
-        return (f"{npc.name}\n"
-                f"Race: {npc.race.value}\n"
-                f"Alignment: {npc.alignment.value}\n\n"
-                f"{appearance}")
-
     def create_menu_bar(self):
         """Create the menu bar with File, Edit, NPCs, Spells, Items, and Help menus"""
         menubar = self.menuBar()
@@ -371,24 +499,26 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def refresh_data(self):
         try:
-            self.repo.load_all()
+            self.repo = reload_shared_repo(self.repo.data_dir)
             
-            self.kb.entries.clear()
-            self.kb._aliases.clear()
-            self.kb._pattern = None
-            self.kb.ingest(self.repo.spells, self.repo.items, self.repo.class_actions)
-            self.kb.ingest_npcs(self.repo.npcs_by_name.values())
-            self.kb.ingest_conditions(self.repo.conditions)
+            self.kb.clear()
+            self.kb.ingest_repo(self.repo)
             
             self.locations = self.repo.top_level_locations
             
-            all_locs = self.repo.get_all_locations()
-            self.model = build_tree_model(self.locations, all_locs)
-            self.location_tree.setModel(self.model)
+            self.model = LocationTreeModel(self.locations)
+            searching = bool(self.search.text().strip())
+            if searching:
+                self.model.fetch_all()  # the active filter needs every branch
+            self.proxy.setSourceModel(self.model)
             
             self.npc_list.clear()
             
-            self.location_tree.expandAll()
+            # Matches can sit deeper than the first level, as in _apply_search_filter
+            if searching:
+                self.location_tree.expandAll()
+            else:
+                self.location_tree.expandToDepth(0)
             
             QtWidgets.QMessageBox.information(self, "Refresh Complete", "All data has been refreshed from files.")
         except Exception as e:
@@ -443,7 +573,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def show_locations(self):
         """Show locations browser window"""
-        locations_window = LocationBrowserWindow(self.kb, self.locations, self.repo, self)
+        locations_window = LocationBrowserWindow(self.kb, self)
         locations_window.show()
 
     def show_conditions(self):
@@ -1,102 +1,291 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import re
-from typing import Dict, Tuple, Optional, Iterable
+import sys
+from typing import Callable, Dict, Tuple, Optional, Iterable
 
 from .Dataclasses import Spell, Item, ClassAction, NPC, Condition
+from .repo import Repo
+
+def _fold(ch: str) -> str:
+    # Lowercase one character, unless that would change its length (e.g. 'İ')
+    low = ch.lower()
+    return low if len(low) == 1 else ch
+
+class _LabelNode:
+    """Compact (radix) trie node: unary chains are collapsed into one edge string."""
+    __slots__ = ("edge", "children", "terminal")
+
+    def __init__(self, edge: str = "", terminal: bool = False):
+        self.edge = edge
+        self.children: Dict[str, "_LabelNode"] = {}  # first char of child edge → child
+        self.terminal = terminal
+
+class _LabelTrie:
+    """Lowercased linkify labels with shared prefixes stored once."""
+    __slots__ = ("root", "size", "longest")
+
+    def __init__(self):
+        self.root = _LabelNode()
+        self.size = 0
+        self.longest = 0  # length of the longest label
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, label: str):
+        key = "".join(_fold(ch) for ch in label)
+        if not key:
+            return
+        self.longest = max(self.longest, len(key))
+        node, i = self.root, 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                node.children[key[i]] = _LabelNode(key[i:], terminal=True)
+                self.size += 1
+                return
+            edge = child.edge
+            k = 1
+            while k < len(edge) and i + k < len(key) and edge[k] == key[i + k]:
+                k += 1
+            if k < len(edge):
+                # Split the edge where the new label diverges
+                mid = _LabelNode(edge[:k])
+                child.edge = edge[k:]
+                mid.children[child.edge[0]] = child
+                node.children[key[i]] = mid
+                child = mid
+            node, i = child, i + k
+        if not node.terminal:
+            node.terminal = True
+            self.size += 1
+
+    def to_regex(self) -> str:
+        return self._node_regex(self.root)
+
+    def _node_regex(self, node: _LabelNode) -> str:
+        # Prefix-factored alternation: each position only tries the branches that share
+        # the text seen so far. Optional tails are greedy, so the longest label still wins.
+        # Sorted so the same labels always give the same source, whatever the insert order
+        branches = [re.escape(c.edge) + self._node_regex(c) for _, c in sorted(node.children.items())]
+        if node.terminal:
+            return "(?:" + "|".join(branches) + ")?" if branches else ""
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+@lru_cache(maxsize=8)
+def _compile_labels(alternation: str) -> re.Pattern:
+    # Shared across KnowledgeBase instances, so rebuilding a KB over the same
+    # labels (e.g. Refresh Data) reuses the compiled pattern.
+    # No lookarounds: word boundaries are checked per match in linkify.
+    # IGNORECASE rather than matching a lowercased copy of the text, so
+    # characters like 'İ'/'ı' and 'ς'/'Σ' fold exactly as Python's re folds them.
+    return re.compile(alternation, re.IGNORECASE)
+
+def _is_word(ch: str) -> bool:
+    # Same characters as the regex \w class
+    return ch.isalnum() or ch == "_"
 
 def _npc_summary(n: NPC, max_len=180) -> str:
-    text = n.appearance.strip() or n.backstory.strip()
-    return (text if len(text) <= max_len else text[:max_len].rstrip() + "…")
+    # Only strip the head up front; the tail is trimmed on the (short) slice we keep
+    text = n.appearance.lstrip() or n.backstory.lstrip()
+    if len(text) <= max_len:
+        return text.rstrip()
+    head = text[:max_len].rstrip()
+    return head if text[max_len:].isspace() else head + "…"
+
+def _description(c: Spell | Item | ClassAction | Condition) -> str:
+    return c.description.strip()
+
+# Hover text builder per content type; a dict lookup instead of an isinstance chain
+_DESC_HANDLERS: Dict[type, Callable[..., str]] = {
+    Spell: _description,
+    Item: _description,
+    ClassAction: _description,
+    Condition: _description,
+    NPC: _npc_summary,
+}
 
-@dataclass
+@dataclass(slots=True)
 class KBEntry:
     content: Spell | Item | ClassAction | NPC | Condition
     name: str
     hover_description: str
+    linked_description: str = ""  # hover_description run through linkify; see KnowledgeBase.hover_html()
+    linked_version: int = 0       # pattern version linked_description was made with (0: not yet)
 
 class KnowledgeBase:
     def __init__(self):
         self.entries: Dict[str, KBEntry] = {}
         self._aliases: Dict[str, str] = {}         # alias(lower) → canonical key
+        self._resolve_map: Dict[str, KBEntry] = {} # name/alias(lower) → entry
+        self._unbound_aliases: list[str] = []      # aliases whose entry wasn't added yet
         self._pattern: Optional[re.Pattern] = None # compiled linkify regex
+        self._trie = _LabelTrie()                  # lowercased labels for linkify
+        self._dirty = True
+        self._pattern_version = 0
+        self.generation = 0  # bumped by clear(), so a build started earlier can tell it is stale
+        # Descriptions are static after ingest, so repeat renders hit this cache
+        self._linkify_cached = lru_cache(maxsize=4096)(self._linkify_impl)
 
     def add_entry(self, entry: KBEntry):
         key = entry.name
+        if key not in self.entries:
+            self._trie.insert(key)
+        elif self.entries[key] is not entry:
+            # Replacing an entry: repoint any aliases bound to the old one
+            for alias, canon in self._aliases.items():
+                if canon == key and self._resolve_map.get(alias) is self.entries[key]:
+                    self._resolve_map[alias] = entry
         self.entries[key] = entry
-        # invalidate compiled pattern
-        self._pattern = None
+        self._resolve_map[key.lower()] = entry
+        self._dirty = True
 
     def add_alias(self, alias: str, canonical_name: str):
-        self._aliases[alias.lower()] = canonical_name
+        key = sys.intern(alias.lower())
+        if key not in self._aliases:
+            self._trie.insert(key)
+        self._aliases[key] = sys.intern(canonical_name)
+        self._bind_alias(key)
+        self._dirty = True
+
+    def _bind_alias(self, key: str):
+        # Canonical names win over aliases that fold to the same label
+        current = self._resolve_map.get(key)
+        if current is not None and current.name.lower() == key:
+            return
+        entry = self.entries.get(self._aliases[key])
+        if entry is None:
+            self._unbound_aliases.append(key)
+        else:
+            self._resolve_map[key] = entry
+
+    def clear(self):
+        self.generation += 1
+        self.entries.clear()
+        self._aliases.clear()
+        self._resolve_map.clear()
+        self._unbound_aliases = []
         self._pattern = None
+        self._trie = _LabelTrie()
+        self._dirty = True
+
+    def adopt(self, other: "KnowledgeBase"):
+        """Take over the contents of another (finalized) KnowledgeBase, e.g. one built on a worker thread."""
+        self.entries = other.entries
+        self._aliases = other._aliases
+        self._resolve_map = other._resolve_map
+        self._unbound_aliases = other._unbound_aliases
+        self._pattern = other._pattern
+        self._trie = other._trie
+        self._dirty = other._dirty
+        # A version neither KB has used, so no cached links from before are served
+        self._pattern_version = max(self._pattern_version, other._pattern_version) + 1
 
     def create_kb_entry(self, content: Spell | Item | ClassAction | NPC | Condition) -> KBEntry:
-        if isinstance(content, Spell) or isinstance(content, Item) or isinstance(content, ClassAction) or isinstance(content, Condition):
-            desc = content.description.strip()
-        elif isinstance(content, NPC):
-            desc = _npc_summary(content)
-        # return KBEntry(kind=kind, name=ability.name, description=ability.description)
-        return KBEntry(content=content, name=content.name, hover_description=desc)
+        try:
+            handler = _DESC_HANDLERS[type(content)]
+        except KeyError:
+            # Subclass of a known type: find its handler once and remember it
+            handler = next(h for t, h in _DESC_HANDLERS.items() if isinstance(content, t))
+            _DESC_HANDLERS[type(content)] = handler
+        return KBEntry(content=content, name=content.name, hover_description=handler(content))
 
     def resolve(self, label: str) -> Optional[KBEntry]:
-        if label in self.entries:
-            return self.entries[label]
-        canon = self._aliases.get(label.lower())
-        return self.entries.get(canon) if canon else None
-
-    def ingest(self, spells: Iterable[Spell], items: Iterable[Item], actions: Iterable[ClassAction]):
-        for s in spells:
-            self.add_entry(self.create_kb_entry(s))
-            for a in getattr(s, "aliases", []):
-                self.add_alias(a, s.name)
+        return self._resolve_map.get(label.lower())
 
-        for it in items:
-            self.add_entry(self.create_kb_entry(it))
-            for a in getattr(it, "aliases", []):
-                self.add_alias(a, it.name)
+    def ingest_repo(self, repo: Repo):
+        """Ingest everything a loaded Repo holds and compile the linkify pattern once at the end."""
+        self.ingest(repo.spells, repo.items, repo.class_actions)
+        self.ingest_npcs(repo.npcs_by_name.values())
+        self.ingest_conditions(repo.conditions)
+        self.finalize()
 
-        for ac in actions:
-            self.add_entry(self.create_kb_entry(ac))
-            for a in getattr(ac, "aliases", []):
-                self.add_alias(a, ac.name)
+    def ingest(self, spells: Iterable[Spell], items: Iterable[Item], actions: Iterable[ClassAction]):
+        self._ingest_all(spells)
+        self._ingest_all(items)
+        self._ingest_all(actions)
 
     def ingest_npcs(self, npcs: Iterable[NPC], alias_key: str = "aliases"):
-        for n in npcs:
-            self.add_entry(KBEntry(content=n, name=n.name, hover_description=_npc_summary(n)))
-            # If you store aliases with the NPC JSON, add them
-            aliases = getattr(n, alias_key, None) or []
-            for a in aliases:
-                self.add_alias(a, n.name)
+        # If you store aliases with the NPC JSON, they are added too
+        self._ingest_all(npcs, alias_key)
 
     def ingest_conditions(self, conditions: Iterable[Condition]):
-        for c in conditions:
-            self.add_entry(self.create_kb_entry(c))
-            # Add common aliases for conditions if needed
-            for a in getattr(c, "aliases", []):
-                self.add_alias(a, c.name)
+        self._ingest_all(conditions)
+
+    def _ingest_all(self, contents: Iterable, alias_key: str = "aliases"):
+        for c in contents:
+            entry = self.create_kb_entry(c)
+            self.add_entry(entry)
+            # aliases may be missing (NPC) or None (ClassAction default)
+            aliases = getattr(c, alias_key, None)
+            if aliases:
+                for a in aliases:
+                    self.add_alias(a, entry.name)
+
+    def finalize(self):
+        """Compile the linkify pattern once all ingests are done. Cheap if nothing changed."""
+        if not self._dirty:
+            return
+        unbound, self._unbound_aliases = self._unbound_aliases, []
+        for key in unbound:
+            self._bind_alias(key)
+        self._dirty = False
+        self._pattern_version += 1
+        self._compile_pattern()
+
+    def hover_html(self, entry: KBEntry) -> str:
+        """entry's hover text with other KB names linked. Linkified on first use and kept until the labels change."""
+        self.finalize()
+        if entry.linked_version != self._pattern_version:
+            entry.linked_description = self.linkify(entry.hover_description)
+            entry.linked_version = self._pattern_version
+        return entry.linked_description
 
     def _compile_pattern(self):
-        # Build a single regex of all keys + aliases, longest-first.
-        labels = set(self.entries.keys())
-        labels.update(self._aliases.keys())
-        if not labels:
+        # Build a single regex of all keys + aliases from the label trie.
+        if not self._trie:
             self._pattern = None
             return
-        parts = sorted((re.escape(x) for x in labels), key=len, reverse=True)
-        # Use word boundaries where possible; allow spaces in multi-word names.
-        self._pattern = re.compile(r'(?<!\w)(' + "|".join(parts) + r')(?!\w)', flags=re.IGNORECASE)
+        self._pattern = _compile_labels(self._trie.to_regex())
 
     def linkify(self, text: str) -> str:
-        if self._pattern is None:
-            self._compile_pattern()
+        self.finalize()
         if not self._pattern:
             return text
+        return self._linkify_cached(self._pattern_version, text)
+
+    def _linkify_impl(self, version: int, text: str) -> str:
+        # version is only part of the cache key; finalize() bumps it on every rebuild
 
-        def repl(m: re.Match):
-            label = m.group(1)
-            # Keep the original casing for display; href uses the canonical lookup label
-            # We'll resolve case-insensitively in _on_link_hovered/_on_anchor_clicked
+        # The href is the displayed text; resolve() looks it up case-insensitively.
+        out = []
+        last = pos = 0
+        n = len(text)
+        pattern = self._pattern
+        longest = self._trie.longest
+        while (m := pattern.search(text, pos)):
+            start, end = m.span()
+            if start and _is_word(text[start - 1]):
+                pos = start + 1
+                continue
+            # Take the longest label that ends at a word boundary. Under IGNORECASE
+            # sibling branches can overlap (e.g. 'i' and 'ı'), so the regex's own
+            # match isn't necessarily the longest one at this start.
+            end = next((e for e in range(min(n, start + longest), start, -1)
+                        if (e == n or not _is_word(text[e]))
+                        and (e == end or pattern.fullmatch(text, start, e))), None)
+            if end is None:
+                pos = start + 1
+                continue
+            label = text[start:end]
+            out.append(text[last:start])
             # Style links with bright yellow color and underline
-            return f'<a href="{label}" style="color: #FFD700; text-decoration: underline;">{label}</a>'
-        
-        return self._pattern.sub(repl, text)
\ No newline at end of file
+            out.append(f'<a href="{label}" style="color: #FFD700; text-decoration: underline;">{label}</a>')
+            last = pos = end
+        if not out:
+            return text
+        out.append(text[last:])
+        return "".join(out)
\ No newline at end of file
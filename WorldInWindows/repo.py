@@ -1,17 +1,73 @@
+import copy
 import json
+import re
+import sys
+import threading
+from dataclasses import fields
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import List, TypeVar, Dict, Optional
+from typing import Callable, List, TypeVar, Dict, Optional
+
+try:
+    # Optional: faster parsing of the Data files; the stdlib reads them the same way
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 from .Dataclasses import Item, Spell, ClassAction, NPC, Race, Location, Condition, StatBlock, MonsterManual, PcClass, PcClassName, AbilityScores, Alignment
 
 T = TypeVar("T", Spell, Item, ClassAction, NPC)
 
+@lru_cache(maxsize=None)
+def _enum_lookup(enum_cls) -> dict:
+    # Accept member names as well as values; values win if the two ever clash
+    return {**{e.name: e for e in enum_cls}, **{e.value: e for e in enum_cls}}
+
 def _parse_enum(enum_cls, value: str):
     try:
-        return enum_cls(value)
-    except Exception:
+        return _enum_lookup(enum_cls)[value]
+    except (KeyError, TypeError):
         return getattr(enum_cls, value)
 
+# Per-dataclass (init field names, positional getter), built on first use
+_FIELD_GETTERS: Dict[type, tuple] = {}
+
+def _field_getter(cls) -> tuple:
+    spec = _FIELD_GETTERS.get(cls)
+    if spec is None:
+        names = [f.name for f in fields(cls) if f.init]
+        spec = (frozenset(names), itemgetter(*names) if len(names) > 1 else None)
+        _FIELD_GETTERS[cls] = spec
+    return spec
+
+# Short fields drawn from a small set of values; one shared string per distinct value
+_INTERNED_FIELDS: Dict[type, tuple] = {
+    Spell: ("school", "casting_time", "range", "components", "duration"),
+    Item: ("rarity",),
+}
+
+def _intern_fields(obj, names: tuple):
+    for name in names:
+        value = getattr(obj, name)
+        if type(value) is str:
+            setattr(obj, name, sys.intern(value))
+
+# Flat data files → (list attribute, by-name map attribute, dataclass)
+_LIST_FILES = {
+    "spells.json": ("spells", "spells_by_name", Spell),
+    "items.json": ("items", "items_by_name", Item),
+    "class_actions.json": ("class_actions", "class_actions_by_name", ClassAction),
+    "conditions.json": ("conditions", "conditions_by_name", Condition),
+}
+_DATA_FILES = (*_LIST_FILES, "npcs.json", "locations.json")
+
+def _drain(rows: list):
+    """Yield (index, row) pairs, dropping each row from the list as it is handed out."""
+    for i in range(len(rows)):
+        row, rows[i] = rows[i], None
+        yield i, row
+
 class Repo:
     def __init__(self, data_dir: str = "Data"):
         self.data_dir = Path(data_dir)
@@ -34,145 +90,180 @@ class Repo:
         self.top_level_locations: List[Location] = []
         self._all_locations: List[Location] = []  # Flat list of all locations for tree traversal
 
+        # (mtime, size) of each data file as of its last load; see load_new()
+        self._file_sigs: Dict[str, Optional[tuple]] = {}
+
     def load_all(self):
-        self.spells = self._load_list("spells.json", Spell)
-        self.items = self._load_list("items.json", Item)
-        self.class_actions = self._load_list("class_actions.json", ClassAction)
-        self.conditions = self._load_list("conditions.json", Condition)
+        self._load_files(set(_DATA_FILES))
+
+    def load_new(self) -> bool:
+        """Reload only the data files that changed on disk since the last load. Returns True if any did."""
+        changed = {f for f in _DATA_FILES if _file_signature(self.data_dir / f) != self._file_sigs.get(f)}
+        if changed:
+            self._load_files(changed)
+        return bool(changed)
+
+    def with_changes(self) -> "Repo":
+        """This Repo if no data file changed on disk, else a copy with the changed files re-read. self is left untouched."""
+        fresh = copy.copy(self)
+        fresh._file_sigs = dict(self._file_sigs)
+        # _load_files only rebinds attributes to newly built lists/maps, so the copy never writes into ours
+        return fresh if fresh.load_new() else self
+
+    def _load_files(self, filenames: set):
+        # Signatures are taken before reading, so a write racing the read is picked up next time
+        for filename in filenames:
+            self._file_sigs[filename] = _file_signature(self.data_dir / filename)
 
-        self.spells_by_name = {s.name: s for s in self.spells}
-        self.items_by_name = {i.name: i for i in self.items}
-        self.class_actions_by_name = {a.name: a for a in self.class_actions}
-        self.conditions_by_name = {c.name: c for c in self.conditions}
+        # 1) Flat lists and their by-name maps
+        for filename, (list_attr, map_attr, cls) in _LIST_FILES.items():
+            if filename in filenames:
+                loaded = self._load_list(filename, cls)
+                setattr(self, list_attr, loaded)
+                setattr(self, map_attr, {c.name: c for c in loaded})
 
         # 2) NPCs (build stat blocks from spec)
-        npcs_raw = self._read_json("npcs.json")
-        self._build_npcs(npcs_raw)
+        if "npcs.json" in filenames:
+            self._build_npcs(self._read_json("npcs.json"))
 
-        # 3) Locations (create shells, attach NPCs, set nesting)
-        locs_raw = self._read_json("locations.json")
-        self._build_locations(locs_raw)
+        # 3) Locations (create shells, attach NPCs, set nesting); they hold NPC objects, so rebuild with them
+        if filenames & {"npcs.json", "locations.json"}:
+            self._build_locations(self._read_json("locations.json"))
 
     def _read_json(self, filename: str):
         p = self.data_dir / filename
-        if not p.exists():
+        try:
+            # Both parsers take UTF-8 bytes, so skip the separate str decode
+            return _json_loads(p.read_bytes())
+        except FileNotFoundError:
             return []
-        return json.loads(p.read_text(encoding="utf-8"))
 
     def _load_list(self, filename: str, cls):
         raw = self._read_json(filename)
+        names, get = _field_getter(cls)
+        shared = _INTERNED_FIELDS.get(cls, ())
         out = []
-        for i, d in enumerate(raw):
-            try:
-                out.append(cls(**d))
-            except TypeError as e:
-                print(f"[WARN] Skipping {filename}[{i}]: {e}")
+        # Raw dicts are released as they're converted, so they don't all
+        # stay alive next to the finished dataclass list
+        for i, d in _drain(raw):
+            # Rows carrying exactly the dataclass fields (the usual case) are built
+            # positionally; anything else goes through kwargs so defaults and errors apply.
+            if get is not None and d.keys() == names:
+                obj = cls(*get(d))
+            else:
+                try:
+                    obj = cls(**d)
+                except TypeError as e:
+                    print(f"[WARN] Skipping {filename}[{i}]: {e}")
+                    continue
+            # Names are keys in several maps and the KB; share one string object
+            if isinstance(obj.name, str):
+                obj.name = sys.intern(obj.name)
+            _intern_fields(obj, shared)
+            out.append(obj)
         return out
 
 
     def _build_npcs(self, npcs_raw: List[dict]) -> None:
-        for i, row in enumerate(npcs_raw):
+        built: List[NPC] = []
+        for i, row in _drain(npcs_raw):
             try:
-                sb = self._build_stat_block(row.get("stat_block"))
-
-                # Accept additional_traits as list[str] OR list[dict] with 'description'
-                add_traits = row.get("additional_traits", [])
-                norm_traits = []
-                for t in add_traits:
-                    if isinstance(t, str):
-                        norm_traits.append(t)
-                    elif isinstance(t, dict) and "description" in t:
-                        norm_traits.append(t["description"])
-
-                # NPC constructor may be original or extended; handle both
-                try:
-                    npc = NPC(
-                        name=row["name"],
-                        race=_parse_enum(Race, row["race"]),
-                        sex=row.get("sex", ""),
-                        age=row.get("age", ""),
-                        alignment=_parse_enum(Alignment, row["alignment"]),
-                        stat_block=sb if sb is not None else StatBlock(),
-                        appearance=row.get("appearance", ""),
-                        personality=row.get("personality", ""),
-                        backstory=row.get("backstory", ""),
-                        additional_traits=norm_traits,  # works if your NPC supports it
-                        campaign_notes=row.get("campaign_notes", ""),  # Include campaign notes
-                        alive=row.get("alive", True)  # Include alive status
-                    )
-                except TypeError:
-                    # Fallback to legacy signature (no additional_traits)
-                    npc = NPC(
-                        name=row["name"],
-                        race=_parse_enum(Race, row["race"]),
-                        sex=row.get("sex", ""),
-                        age=row.get("age", ""),
-                        alignment=_parse_enum(Alignment, row["alignment"]),
-                        stat_block=sb if sb is not None else StatBlock(),
-                        appearance=row.get("appearance", ""),
-                        personality=row.get("personality", ""),
-                        backstory=row.get("backstory", ""),
-                    )
-                    # attach as attribute for UI if needed
-                    setattr(npc, "additional_traits", norm_traits)
-                    setattr(npc, "campaign_notes", row.get("campaign_notes", ""))
-
-                self.npcs.append(npc)
-                self.npcs_by_name[npc.name] = npc
-
+                built.append(self._construct_npc(row))
             except Exception as e:
                 print(f"[WARN] Skipping npcs.json[{i}]: {e}")
 
+        # Replace rather than extend, so reloading doesn't duplicate NPCs
+        self.npcs = built
+        self.npcs_by_name = {npc.name: npc for npc in built}
+
+    def _construct_npc(self, row: dict) -> NPC:
+        sb = self._build_stat_block(row.get("stat_block"))
+
+        # Accept additional_traits as list[str] OR list[dict] with 'description'
+        add_traits = row.get("additional_traits", [])
+        norm_traits = []
+        for t in add_traits:
+            if isinstance(t, str):
+                norm_traits.append(t)
+            elif isinstance(t, dict) and "description" in t:
+                norm_traits.append(t["description"])
+
+        # NPC constructor may be original or extended; handle both
+        name = sys.intern(row["name"])
+        try:
+            npc = NPC(
+                name=name,
+                race=_parse_enum(Race, row["race"]),
+                sex=row.get("sex", ""),
+                age=row.get("age", ""),
+                alignment=_parse_enum(Alignment, row["alignment"]),
+                stat_block=sb if sb is not None else StatBlock(),
+                appearance=row.get("appearance", ""),
+                personality=row.get("personality", ""),
+                backstory=row.get("backstory", ""),
+                additional_traits=norm_traits,  # works if your NPC supports it
+                campaign_notes=row.get("campaign_notes", ""),  # Include campaign notes
+                alive=row.get("alive", True)  # Include alive status
+            )
+        except TypeError:
+            # Fallback to legacy signature (no additional_traits)
+            npc = NPC(
+                name=name,
+                race=_parse_enum(Race, row["race"]),
+                sex=row.get("sex", ""),
+                age=row.get("age", ""),
+                alignment=_parse_enum(Alignment, row["alignment"]),
+                stat_block=sb if sb is not None else StatBlock(),
+                appearance=row.get("appearance", ""),
+                personality=row.get("personality", ""),
+                backstory=row.get("backstory", ""),
+            )
+            # attach as attribute for UI if needed
+            setattr(npc, "additional_traits", norm_traits)
+            setattr(npc, "campaign_notes", row.get("campaign_notes", ""))
+        return npc
+
 
     def _build_locations(self, locs_raw: List[dict]) -> None:
-        # First pass: create Location shells
+        # Single pass: create Location shells and note the references to resolve
         loc_objs: Dict[str, Location] = {}
+        pending: List[tuple] = []  # (name, npc names, parent name)
         for i, row in enumerate(locs_raw):
             try:
-                loc = Location(
-                    name=row["name"],
+                name = sys.intern(row["name"])
+                region = row.get("region")
+                loc_objs[name] = Location(
+                    name=name,
                     description=row.get("description", ""),
-                    region=row.get("region"),
+                    region=sys.intern(region) if isinstance(region, str) else region,
                     tags=row.get("tags", []),
                     npcs=[],
                 )
-                loc_objs[row.get("name")] = loc
+                pending.append((name, row.get("npcs", []), row.get("parent")))
             except Exception as e:
                 print(f"[WARN] Skipping locations.json[{i}] (shell): {e}")
 
-        # Second pass: attach NPCs
-        for row in locs_raw:
-            loc = loc_objs.get(row.get("name"))
-            if not loc:
-                continue
-            for name in row.get("npcs", []):
-                npc = self.npcs_by_name.get(name)
+        # Resolve NPCs and parents now that every shell exists
+        npc_lookup = self.npcs_by_name.get
+        loc_lookup = loc_objs.get
+        for name, npc_names, parent_name in pending:
+            loc = loc_objs[name]
+            for npc_name in npc_names:
+                npc = npc_lookup(npc_name)
                 if npc:
-                    try:
-                        loc.add_npc(npc)
-                    except Exception:
-                        # if not dataclass, ensure list append works
-                        if npc not in loc.npcs:
-                            loc.npcs.append(npc)
-
-        # Third pass: establish parent-child relationships
-        for row in locs_raw:
-            loc = loc_objs.get(row.get("name"))
-            if not loc:
-                continue
-            parent = row.get("parent")
-            if parent:
-                parent = loc_objs.get(parent)
+                    loc.add_npc(npc)
+            if parent_name:
+                parent = loc_lookup(parent_name)
                 if parent:
-                    loc.parent = parent
+                    loc.set_parent(parent)
 
-        # Fourth pass: propagate NPCs from child to parent locations
+        # Propagate NPCs from child to parent locations
         # Only propagate from leaf nodes (locations with no children) to avoid redundancy
         all_locs = list(loc_objs.values())
         self._all_locations = all_locs  # Store flat list for tree operations
-        leaf_locations = [loc for loc in all_locs if not loc.get_children(all_locs)]
-        for loc in leaf_locations:
-            if hasattr(loc, 'propagate_npcs_to_parent'):
+        for loc in all_locs:
+            loc.cache_display_text()
+            if not loc.children:
                 loc.propagate_npcs_to_parent()
 
         # Top-level locations (no parent)
@@ -184,7 +275,7 @@ class Repo:
     
     def get_location_children(self, location: Location) -> List[Location]:
         """Get direct children of a location."""
-        return location.get_children(self._all_locations)
+        return list(location.children)
 
     def _build_stat_block(self, spec: Optional[dict]) -> Optional[StatBlock]:
         if not spec:
@@ -202,4 +293,87 @@ class Repo:
             pc = PcClass(name=cls_name, level=level, ability_scores=ability_scores, armor_class=ac, spells=spells)
             return pc
         # Fallback to empty StatBlock
-        return StatBlock()
\ No newline at end of file
+        return StatBlock()
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+# --- Shared, loaded Repo per data directory ---
+_SHARED_REPOS: Dict[str, Repo] = {}
+_SHARED_LOCK = threading.Lock()  # browsers load from worker threads
+
+def get_shared_repo(data_dir: str) -> Repo:
+    """
+    Loaded Repo for data_dir; JSON files that changed on disk are re-read on each call.
+    A Repo that has been handed out is never modified: changes come back as a new Repo
+    that replaces it here, so other threads can keep reading the one they hold.
+    """
+    key = str(Path(data_dir))
+    with _SHARED_LOCK:
+        repo = _SHARED_REPOS.get(key)
+        if repo is None:
+            repo = Repo(data_dir)
+            repo.load_all()
+        else:
+            repo = repo.with_changes()
+        _SHARED_REPOS[key] = repo
+        return repo
+
+def reload_shared_repo(data_dir: str) -> Repo:
+    """Re-read every data file into a new shared Repo for data_dir (e.g. Refresh Data)."""
+    repo = Repo(data_dir)
+    repo.load_all()
+    with _SHARED_LOCK:
+        _SHARED_REPOS[str(Path(data_dir))] = repo
+    return repo
+
+def clear_shared_repos():
+    with _SHARED_LOCK:
+        _SHARED_REPOS.clear()
+
+# --- Editing single records in the Data files ---
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+
+def _encode_record(record: dict) -> str:
+    # Same layout json.dump(..., indent=2) gives an item of a top-level list
+    return json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+
+def update_json_record(path: Path, match: Callable[[dict], bool], update: Callable[[dict], None]) -> bool:
+    """
+    Apply update() to the first record of the JSON list at path that match() accepts,
+    re-encoding only that record; the rest of the file is written back byte for byte.
+    Returns False (and leaves the file alone) if no record matched.
+    """
+    text = path.read_text(encoding="utf-8")
+    decode = json.JSONDecoder().raw_decode
+    pos = _JSON_WS.match(text).end()
+    if not text.startswith("[", pos):
+        raise ValueError(f"{path.name} does not hold a JSON list")
+    pos += 1
+    while True:
+        start = _JSON_WS.match(text, pos).end()
+        if text.startswith("]", start):
+            return False
+        record, end = decode(text, start)
+        if match(record):
+            update(record)
+            path.write_text(text[:start] + _encode_record(record) + text[end:], encoding="utf-8")
+            return True
+        pos = _JSON_WS.match(text, end).end()
+        if text.startswith(",", pos):
+            pos += 1
+
+def append_json_record(path: Path, record: dict):
+    """Add record at the end of the JSON list at path, leaving the existing records' text untouched."""
+    text = path.read_text(encoding="utf-8")
+    stripped = text.strip()
+    if not (stripped.startswith("[") and stripped.endswith("]")):
+        raise ValueError(f"{path.name} does not hold a JSON list")
+    end = text.rindex("]")
+    body = text[:end].rstrip()
+    sep = "\n  " if body.endswith("[") else ",\n  "
+    path.write_text(body + sep + _encode_record(record) + "\n" + text[end:], encoding="utf-8")
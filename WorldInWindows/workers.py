@@ -0,0 +1,32 @@
+from PyQt6 import QtCore
+from typing import Callable, Optional
+
+class WorkerSignals(QtCore.QObject):
+    """Signals for Worker; lives on the creating (UI) thread so slots run there."""
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+
+class Worker(QtCore.QRunnable):
+    """Runs fn(*args) on a pool thread and reports the result through signals."""
+    def __init__(self, fn: Callable, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+def run_in_background(fn: Callable, *args, on_done: Callable, on_error: Optional[Callable] = None) -> Worker:
+    """Start fn(*args) on the global thread pool. Keep the returned Worker referenced until it reports back."""
+    worker = Worker(fn, *args)
+    worker.signals.finished.connect(on_done)
+    if on_error is not None:
+        worker.signals.failed.connect(on_error)
+    QtCore.QThreadPool.globalInstance().start(worker)
+    return worker
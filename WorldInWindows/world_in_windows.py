@@ -8,34 +8,57 @@
 # pip install PyQt6
 
 import sys
-from PyQt6 import QtWidgets
+from PyQt6 import QtGui, QtWidgets
 
 from .Windows.main_window import MainWindow
 from .theme import DMHelperTheme
 from .knowledge_base import KnowledgeBase
-from .repo import Repo
+from .repo import get_shared_repo
 from .config import Config
+from .workers import run_in_background
 
 # Global config instance
 config = Config()
 
+def _build_knowledge_base(repo) -> KnowledgeBase:
+    kb = KnowledgeBase()
+    kb.ingest_repo(repo)
+    return kb
+
 # --- App entry ---
 def main():
-    repo = Repo(config.data_dir)
-    repo.load_all()
-
-    kb = KnowledgeBase()
-    kb.ingest(repo.spells, repo.items, repo.class_actions)
-    kb.ingest_npcs(repo.npcs_by_name.values())
-    kb.ingest_conditions(repo.conditions)
+    # The same loaded Repo the browsers and dialogs reuse, so the data is parsed once at startup
+    repo = get_shared_repo(config.data_dir)
 
     app = QtWidgets.QApplication(sys.argv)
+    # Room for decoded portraits/icons shared between detail windows (KB)
+    QtGui.QPixmapCache.setCacheLimit(65536)
     
     # Apply the D&D themed styling
     DMHelperTheme.apply_to_application(app)
     
+    # Show the window straight away and fill the knowledge base off the UI thread;
+    # windows opened meanwhile just render without links until it lands
+    kb = KnowledgeBase()
     win = MainWindow(repo, kb)
     win.show()
+    win.statusBar().showMessage("Loading knowledge base…")
+
+    started_generation = kb.generation
+
+    def on_kb_ready(built: KnowledgeBase):
+        if kb.generation != started_generation:
+            # Refresh Data already repopulated it from newer files
+            win.statusBar().clearMessage()
+            return
+        kb.adopt(built)
+        win.statusBar().showMessage("Knowledge base loaded.", 3000)
+
+    def on_kb_failed(error: str):
+        print(f"Warning: Could not build knowledge base: {error}")
+        win.statusBar().showMessage("Knowledge base failed to load.", 5000)
+
+    kb_loader = run_in_background(_build_knowledge_base, repo, on_done=on_kb_ready, on_error=on_kb_failed)
     sys.exit(app.exec())
 
 if __name__ == "__main__":